@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Crash-safe file replacement for the snapshot writers in avl.py and avl_array.py.
+"""
+import contextlib
+import os
+import threading
+
+
+@contextlib.contextmanager
+def atomic_write(path):
+    """
+    Open a temporary file next to path for writing and move it over path when done.
+
+    The target is only replaced once the new contents are completely written and
+    flushed to disk, so a crash or an exception mid-write leaves the previous
+    file intact. The temporary name is unique per process and thread, so
+    concurrent writers of one path do not clobber each other's partial files.
+
+    Parameters:
+    path (str): The file to replace.
+
+    Returns:
+    file: A binary file object for the new contents.
+    """
+    path = os.fspath(path)
+    temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temporary, 'wb') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temporary)
+        raise
@@ -1,22 +1,174 @@
 #!/usr/bin/env python3
 import threading
 import logging
-from collections import deque
+import time
+from bisect import bisect_left, bisect_right
+import mmap as mmap_module
+import os
+import pickle
+import struct
+from array import array
+from collections import Counter, deque
+from collections.abc import Sequence
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from atomic_file import atomic_write
+
+# Per-operation tracing is opt-in: enable DEBUG on this logger to see it
+logger = logging.getLogger(__name__)
+
+# Snapshot file layout: magic, key count, then the keys in order as native int64
+SNAPSHOT_MAGIC = b'AVLT'
+SNAPSHOT_HEADER = struct.Struct('=4s4xQ')
+# AVLMap snapshots share the header; the payload is the pickled (key, value) pairs
+MAP_SNAPSHOT_MAGIC = b'AVLM'
 
 class AVLNode:
+    __slots__ = ('left', 'right', 'val', 'height', 'size')
+
+    # Copies of val; a class attribute so plain nodes pay no slot for it
+    count = 1
+
     def __init__(self, key):
         self.left = None
         self.right = None
         self.val = key
         self.height = 1
+        self.size = 1
+
+
+class AVLMapNode(AVLNode):
+    __slots__ = ('value',)
+
+    def __init__(self, key):
+        super().__init__(key)
+        self.value = None
+
+
+class AVLMultisetNode(AVLNode):
+    __slots__ = ('count',)
+
+    def __init__(self, key):
+        super().__init__(key)
+        self.count = 1
+
+class AVLMetrics:
+    """
+    Low-overhead instrumentation for an AVLTree.
+
+    Counts operations (per key for batches), rotations, the largest height seen
+    and the time spent waiting for the tree lock. With ``sample_every`` set, every
+    n-th operation is also timed into a latency histogram whose buckets are powers
+    of two in microseconds. Counters updated by lock-free readers (SnapshotAVLTree)
+    are approximate.
+
+    :Example:
+
+    >>> tree = AVLTree(metrics=AVLMetrics(sample_every=1))
+    >>> tree.batch_insert([1, 2, 3])
+    >>> tree.metrics.report()['rotations'], tree.metrics.report()['operations']
+    (1, {'batch_insert': 3})
+    """
+
+    def __init__(self, sample_every=0):
+        self.sample_every = sample_every
+        self.reset()
+
+    def reset(self):
+        """
+        Clear all counters.
+        """
+        self.operations = Counter()
+        self.rotations = 0
+        self.max_height = 0
+        self.lock_wait_ns = 0
+        self.latency_histogram = Counter()
+        self._calls = 0
+
+    def report(self):
+        """
+        Return the collected metrics as plain values.
+
+        Returns:
+        dict: Operation counts, rotations, max height, lock wait time in seconds
+            and the sampled latency histogram ({bucket upper bound in us: samples}).
+        """
+        return {
+            'operations': dict(self.operations),
+            'rotations': self.rotations,
+            'max_height': self.max_height,
+            'lock_wait_seconds': self.lock_wait_ns / 1e9,
+            'latency_histogram_us': dict(sorted(self.latency_histogram.items())),
+        }
+
+    def record(self, lock, operation, count, tree):
+        return _RecordedOperation(self, lock, operation, count, tree)
+
+
+class _RecordedOperation:
+    # Context manager wrapping a lock acquisition when metrics are enabled
+    __slots__ = ('metrics', 'lock', 'operation', 'count', 'tree', 'started', 'sampled')
+
+    def __init__(self, metrics, lock, operation, count, tree):
+        self.metrics = metrics
+        self.lock = lock
+        self.operation = operation
+        self.count = count
+        self.tree = tree
+
+    def __enter__(self):
+        metrics = self.metrics
+        requested = time.perf_counter_ns()
+        self.lock.__enter__()
+        self.started = time.perf_counter_ns()
+        metrics.lock_wait_ns += self.started - requested
+        metrics.operations[self.operation] += self.count
+        metrics._calls += 1
+        self.sampled = metrics.sample_every and metrics._calls % metrics.sample_every == 0
+        return self
+
+    def __exit__(self, *exc_info):
+        metrics = self.metrics
+        if self.sampled:
+            elapsed_us = (time.perf_counter_ns() - self.started) // 1000
+            metrics.latency_histogram[1 << elapsed_us.bit_length()] += 1
+        height = self.tree._get_height(self.tree.root)
+        if height > metrics.max_height:
+            metrics.max_height = height
+        return self.lock.__exit__(*exc_info)
+
 
 class AVLTree:
-    def __init__(self):
+    # Node type created by every code path; subclasses with extra augmentation override it
+    node_class = AVLNode
+    # Set operations may reuse (mutate) input nodes; copy-on-write subclasses flip this
+    _copy_on_write = False
+    # Snapshot file magic and the number of int64 values save() stores per key
+    _snapshot_magic = SNAPSHOT_MAGIC
+    _snapshot_width = 1
+
+    def __init__(self, iterative=True, metrics=None, pool=None):
+        """
+        Create an empty AVL tree.
+
+        Parameters:
+        iterative (bool): Use the iterative engine (explicit path stack) for insert,
+            delete and search. Set to False for the recursive engine.
+        metrics (AVLMetrics or bool): Collect metrics into this object (True for a
+            default AVLMetrics). Disabled by default, which costs one attribute check
+            per operation.
+        pool (NodePool): Recycle nodes through this node_pool.NodePool of
+            ``node_class``. Deleted nodes are reset and reused, so nodes returned by
+            ``search`` must not be kept across deletes.
+        """
+        if pool is not None and pool.node_class is not self.node_class:
+            raise ValueError(f"pool must hold {self.node_class.__name__} objects")
         self.root = None
+        self.iterative = iterative
+        self.metrics = AVLMetrics() if metrics is True else (metrics or None)
+        self.pool = pool
         self.tree_lock = threading.RLock()
+        # Read-only queries hold this; SnapshotAVLTree swaps in a no-op context
+        self._read_lock = self.tree_lock
 
     def insert(self, key):
         """
@@ -28,20 +180,20 @@ class AVLTree:
         Returns:
         None
         """
-        with self.tree_lock:
-            self.root = self._insert(self.root, key)
-            logging.info(f'Inserted key: {key}')
+        with self._instrumented(self.tree_lock, 'insert'):
+            self._insert_key(key)
+            logger.debug('Inserted key: %s', key)
 
     def _insert(self, node, key):
         if not node:
-            return AVLNode(key)
+            return self._new_node(key)
 
         if key < node.val:
             node.left = self._insert(node.left, key)
         else:
             node.right = self._insert(node.right, key)
 
-        node.height = 1 + max(self._get_height(node.left), self._get_height(node.right))
+        self._update(node)
         return self._rebalance(node)
 
     def delete(self, key):
@@ -54,9 +206,9 @@ class AVLTree:
         Returns:
         None
         """
-        with self.tree_lock:
-            self.root = self._delete(self.root, key)
-            logging.info(f'Deleted key: {key}')
+        with self._instrumented(self.tree_lock, 'delete'):
+            self._delete_key(key)
+            logger.debug('Deleted key: %s', key)
 
     def _delete(self, node, key):
         if not node:
@@ -68,15 +220,15 @@ class AVLTree:
             node.right = self._delete(node.right, key)
         else:
             if node.left is None:
-                return node.right
+                return self._release(node, node.right)
             elif node.right is None:
-                return node.left
+                return self._release(node, node.left)
 
             temp = self._get_min_value_node(node.right)
-            node.val = temp.val
+            self._copy_payload(node, temp)
             node.right = self._delete(node.right, temp.val)
 
-        node.height = 1 + max(self._get_height(node.left), self._get_height(node.right))
+        self._update(node)
         return self._rebalance(node)
 
     def search(self, key):
@@ -89,11 +241,91 @@ class AVLTree:
         Returns:
         AVLNode: The node containing the key, or None if the key is not found.
         """
-        with self.tree_lock:
-            result = self._search(self.root, key)
-            logging.info(f'Searched for key: {key}, Found: {result is not None}')
+        with self._instrumented(self._read_lock, 'search'):
+            result = self._search_key(key)
+            logger.debug('Searched for key: %s, Found: %s', key, result is not None)
             return result
 
+    def search_many(self, keys):
+        """
+        Search for a batch of keys in one pass over the tree.
+
+        The probes are sorted once and descend the tree together, so a node is
+        visited at most once per batch. Batches larger than half the tree switch
+        to a merge of the sorted probes against an in-order walk of the tree.
+
+        Parameters:
+        keys (list of int): The keys to search for.
+
+        Returns:
+        list of AVLNode: The node containing each key (None when absent), in input order.
+        """
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        probes = [keys[i] for i in order]
+        with self._instrumented(self._read_lock, 'search_many', len(keys)):
+            root = self.root
+            if 2 * len(probes) > self._get_size(root):
+                found = self._search_merge(root, probes)
+            else:
+                found = self._search_descent(root, probes)
+            logger.debug('Searched for %d keys in one batch', len(keys))
+
+        results = [None] * len(keys)
+        for i, node in zip(order, found):
+            results[i] = node
+        return results
+
+    def contains_many(self, keys):
+        """
+        Check a batch of keys for membership in one pass over the tree.
+
+        Parameters:
+        keys (list of int): The keys to look up.
+
+        Returns:
+        list of bool: Whether each key is present, in input order.
+        """
+        return [node is not None for node in self.search_many(keys)]
+
+    def _search_descent(self, root, probes):
+        # Each stack entry is a subtree with the slice of sorted probes that can only
+        # be found inside it; a node splits its slice around its own key
+        found = [None] * len(probes)
+        stack = [(root, 0, len(probes))] if root is not None and probes else []
+        while stack:
+            node, lo, hi = stack.pop()
+            if hi - lo == 1:
+                # A lone probe finishes with a plain descent
+                key = probes[lo]
+                while node is not None and node.val != key:
+                    node = node.left if key < node.val else node.right
+                found[lo] = node
+                continue
+            i = bisect_left(probes, node.val, lo, hi)
+            j = bisect_right(probes, node.val, i, hi)
+            for k in range(i, j):
+                found[k] = node
+            if lo < i and node.left is not None:
+                stack.append((node.left, lo, i))
+            if j < hi and node.right is not None:
+                stack.append((node.right, j, hi))
+        return found
+
+    def _search_merge(self, root, probes):
+        found = [None] * len(probes)
+        i = 0
+        for node in self._iter_nodes(root):
+            while i < len(probes) and probes[i] < node.val:
+                i += 1
+            if i == len(probes):
+                break
+            j = i
+            while j < len(probes) and probes[j] == node.val:
+                found[j] = node
+                j += 1
+            i = j
+        return found
+
     def _search(self, node, key):
         if not node or node.val == key:
             return node
@@ -102,6 +334,114 @@ class AVLTree:
             return self._search(node.left, key)
         return self._search(node.right, key)
 
+    def _instrumented(self, lock, operation, count=1):
+        # The lock itself when metrics are off, a recording wrapper around it otherwise
+        if self.metrics is None:
+            return lock
+        return self.metrics.record(lock, operation, count, self)
+
+    def _insert_key(self, key):
+        if self.iterative:
+            self._insert_iterative(key)
+        else:
+            self.root = self._insert(self.root, key)
+
+    def _delete_key(self, key):
+        if self.iterative:
+            self._delete_iterative(key)
+        else:
+            self.root = self._delete(self.root, key)
+
+    def _search_key(self, key):
+        if self.iterative:
+            return self._search_iterative(key)
+        return self._search(self.root, key)
+
+    def _insert_iterative(self, key):
+        new_node = self._new_node(key)
+        path = []
+        node = self.root
+        while node is not None:
+            path.append(node)
+            node = node.left if key < node.val else node.right
+
+        if not path:
+            self.root = new_node
+            return
+
+        parent = path[-1]
+        if key < parent.val:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        self._retrace(path)
+
+    def _delete_iterative(self, key):
+        path = []
+        node = self.root
+        while node is not None:
+            if key < node.val:
+                path.append(node)
+                node = node.left
+            elif key > node.val:
+                path.append(node)
+                node = node.right
+            else:
+                break
+
+        if node is None:
+            return
+
+        if node.left is not None and node.right is not None:
+            # Copy the in-order successor into this node and unlink the successor instead
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            self._copy_payload(node, successor)
+            node, child = successor, successor.right
+        else:
+            child = node.left if node.left is not None else node.right
+
+        self._replace_child(path[-1] if path else None, node, child)
+        self._retrace(path)
+        self._release(node)
+
+    def _search_iterative(self, key):
+        node = self.root
+        while node is not None and node.val != key:
+            node = node.left if key < node.val else node.right
+        return node
+
+    def _replace_child(self, parent, old, new):
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
+    def _retrace(self, path):
+        # Walk back up the search path, fixing heights and rebalancing. Once a
+        # subtree keeps its previous height, no ancestor needs rebalancing and
+        # only their augmented fields (sizes) still need refreshing.
+        i = len(path) - 1
+        while i >= 0:
+            node = path[i]
+            old_height = node.height
+            self._update(node)
+            subtree = self._rebalance(node)
+            if subtree is not node:
+                self._replace_child(path[i - 1] if i else None, node, subtree)
+            i -= 1
+            if subtree.height == old_height:
+                break
+
+        while i >= 0:
+            self._update_size(path[i])
+            i -= 1
+
     def batch_insert(self, keys):
         """
         Perform batch insertions of keys into the AVL tree.
@@ -112,10 +452,12 @@ class AVLTree:
         Returns:
         None
         """
-        with self.tree_lock:
+        trace = logger.isEnabledFor(logging.DEBUG)
+        with self._instrumented(self.tree_lock, 'batch_insert', len(keys)):
             for key in keys:
-                self.root = self._insert(self.root, key)
-                logging.info(f'Batch inserted key: {key}')
+                self._insert_key(key)
+                if trace:
+                    logger.debug('Batch inserted key: %s', key)
 
     def batch_delete(self, keys):
         """
@@ -127,10 +469,607 @@ class AVLTree:
         Returns:
         None
         """
-        with self.tree_lock:
+        trace = logger.isEnabledFor(logging.DEBUG)
+        with self._instrumented(self.tree_lock, 'batch_delete', len(keys)):
             for key in keys:
-                self.root = self._delete(self.root, key)
-                logging.info(f'Batch deleted key: {key}')
+                self._delete_key(key)
+                if trace:
+                    logger.debug('Batch deleted key: %s', key)
+
+    def bulk_load(self, keys, presorted=False):
+        """
+        Replace the contents of the tree with a perfectly balanced tree built from keys.
+
+        The keys are sorted once (unless presorted is True) and the tree is built
+        bottom-up in linear time, without any per-key rebalancing.
+
+        Parameters:
+        keys (iterable of int): The keys to load into the tree.
+        presorted (bool): Trust that keys are already in ascending order.
+
+        Returns:
+        None
+        """
+        if not presorted:
+            keys = sorted(keys)
+        elif not isinstance(keys, Sequence):
+            keys = list(keys)
+        with self._instrumented(self.tree_lock, 'bulk_load', len(keys)):
+            self.root = self._build_balanced(keys, 0, len(keys))
+            logger.debug('Bulk loaded %d keys', len(keys))
+
+    @classmethod
+    def from_iterable(cls, keys, presorted=False):
+        """
+        Build a new AVL tree from an iterable of keys in linear time.
+
+        Parameters:
+        keys (iterable of int): The keys to load into the tree.
+        presorted (bool): Trust that keys are already in ascending order.
+
+        Returns:
+        AVLTree: A perfectly balanced tree holding all keys.
+        """
+        tree = cls()
+        tree.bulk_load(keys, presorted=presorted)
+        return tree
+
+    def save(self, path):
+        """
+        Write the keys of the tree to a compact binary snapshot file.
+
+        The file holds a small header followed by the keys in order as native
+        int64 values, so load() can rebuild the tree without any rebalancing.
+        An existing file is only replaced once the new snapshot is complete.
+
+        Parameters:
+        path (str): The file to write.
+
+        Returns:
+        None
+
+        Raises:
+        TypeError: If a key does not fit in an int64.
+        """
+        with self._read_lock:
+            try:
+                values = array('q', self._snapshot_values())
+            except (TypeError, OverflowError) as e:
+                raise TypeError(f"{type(self).__name__} snapshots store keys as int64 values") from e
+        count = len(values) // self._snapshot_width
+        with atomic_write(path) as f:
+            f.write(SNAPSHOT_HEADER.pack(self._snapshot_magic, count))
+            values.tofile(f)
+        logger.debug('Saved %d keys to %s', count, path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Build a tree from a snapshot file written by save().
+
+        Parameters:
+        path (str): The file to read.
+        mmap (bool): Memory-map the file and read the keys in place instead of
+            copying them into memory first.
+
+        Returns:
+        AVLTree: A perfectly balanced tree holding the saved keys.
+
+        Raises:
+        ValueError: If the file is not an AVL tree snapshot or its length does
+            not match the header.
+        """
+        with open(path, 'rb') as f:
+            header = f.read(SNAPSHOT_HEADER.size)
+            if len(header) != SNAPSHOT_HEADER.size:
+                raise ValueError(f"{path} is not an AVL tree snapshot")
+            magic, count = SNAPSHOT_HEADER.unpack(header)
+            if magic != cls._snapshot_magic:
+                raise ValueError(f"{path} is not an AVL tree snapshot")
+            length = count * cls._snapshot_width
+            if os.fstat(f.fileno()).st_size != SNAPSHOT_HEADER.size + length * 8:
+                raise ValueError(f"{path} does not hold the {count} keys its header declares")
+            if not mmap:
+                values = array('q')
+                values.fromfile(f, length)
+                return cls._from_snapshot_values(values)
+            if count == 0:
+                return cls()
+            with mmap_module.mmap(f.fileno(), 0, access=mmap_module.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    with view[SNAPSHOT_HEADER.size:].cast('q') as values:
+                        return cls._from_snapshot_values(values)
+
+    def _snapshot_values(self):
+        # The int64 values save() writes, _snapshot_width per key, in key order
+        for node in self._iter_nodes(self.root):
+            for _ in range(node.count):
+                yield node.val
+
+    @classmethod
+    def _from_snapshot_values(cls, values):
+        # Inverse of _snapshot_values for a sequence of int64 values
+        return cls.from_iterable(values, presorted=True)
+
+    def _make_node(self, item):
+        # Bulk-load hook turning one loaded item into a node
+        return self._new_node(item)
+
+    def _new_node(self, key):
+        if self.pool is None:
+            return self.node_class(key)
+        return self.pool.acquire(key)
+
+    def _release(self, node, result=None):
+        # Hand an unlinked node back to the pool; returns result for tail calls
+        if self.pool is not None:
+            self.pool.release(node)
+        return result
+
+    def _find_path(self, key):
+        # Return the node holding key (or None) and the search path of its ancestors
+        path = []
+        node = self.root
+        while node is not None and node.val != key:
+            path.append(node)
+            node = node.left if key < node.val else node.right
+        return node, path
+
+    def _attach(self, path, new_node):
+        if not path:
+            self.root = new_node
+            return
+
+        parent = path[-1]
+        if new_node.val < parent.val:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        self._retrace(path)
+
+    def _iter_nodes(self, node):
+        # In-order traversal with an explicit stack, O(height) memory
+        stack = []
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            node = node.right
+
+    def _build_balanced(self, keys, lo, hi):
+        if lo >= hi:
+            return None
+
+        mid = (lo + hi) // 2
+        node = self._make_node(keys[mid])
+        node.left = self._build_balanced(keys, lo, mid)
+        node.right = self._build_balanced(keys, mid + 1, hi)
+        self._update(node)
+        return node
+
+    def __len__(self):
+        return self._get_size(self.root)
+
+    def __contains__(self, key):
+        with self._read_lock:
+            return self._search_iterative(key) is not None
+
+    def rank(self, key):
+        """
+        Count the keys strictly smaller than key.
+
+        Parameters:
+        key (int): The key to rank.
+
+        Returns:
+        int: The number of keys in the tree smaller than key.
+        """
+        with self._read_lock:
+            return self._count_below(self.root, key, inclusive=False)
+
+    def select(self, k):
+        """
+        Return the k-th smallest key (0-based).
+
+        Parameters:
+        k (int): The position of the key in sorted order.
+
+        Returns:
+        int: The k-th smallest key.
+
+        Raises:
+        IndexError: If k is outside the range of the tree.
+        """
+        with self._read_lock:
+            node = self.root
+            if not 0 <= k < self._get_size(node):
+                raise IndexError("select index out of range")
+            while True:
+                left_size = self._get_size(node.left)
+                if k < left_size:
+                    node = node.left
+                elif k < left_size + node.count:
+                    return node.val
+                else:
+                    k -= left_size + node.count
+                    node = node.right
+
+    def count_range(self, lo, hi):
+        """
+        Count the keys k with lo <= k <= hi.
+
+        Parameters:
+        lo (int): The lower bound, inclusive.
+        hi (int): The upper bound, inclusive.
+
+        Returns:
+        int: The number of keys in the range.
+        """
+        with self._read_lock:
+            if hi < lo:
+                return 0
+            root = self.root
+            return self._count_below(root, hi, inclusive=True) - self._count_below(root, lo, inclusive=False)
+
+    def range(self, lo, hi):
+        """
+        Lazily yield the keys k with lo <= k <= hi in ascending order.
+
+        The iterator keeps O(log n) state and must not be interleaved with
+        modifications of the tree.
+
+        Parameters:
+        lo (int): The lower bound, inclusive.
+        hi (int): The upper bound, inclusive.
+
+        Returns:
+        generator of int: The keys in the range.
+        """
+        return self.irange(lo, hi)
+
+    def __iter__(self):
+        return self.irange()
+
+    def __reversed__(self):
+        return self.irange(reverse=True)
+
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        """
+        Lazily yield the keys between lo and hi.
+
+        Seeks to the first key in O(log n) and then yields one key at a time from
+        an explicit stack, so a scan holds O(log n) state however many keys it
+        returns. It must not be interleaved with modifications of the tree;
+        SnapshotAVLTree iterates over a stable snapshot instead.
+
+        Parameters:
+        lo (int): The lower bound, or None for no lower bound.
+        hi (int): The upper bound, or None for no upper bound.
+        inclusive (tuple of bool): Whether lo and hi themselves are included.
+        reverse (bool): Yield the keys in descending order.
+
+        Returns:
+        generator of int: The keys in the range.
+        """
+        lo_inclusive, hi_inclusive = inclusive
+        stack = []
+        node = self.root
+        while True:
+            # Push the spine towards the first key, skipping subtrees outside the range
+            while node is not None:
+                val = node.val
+                if not reverse:
+                    if lo is not None and (val < lo or (val == lo and not lo_inclusive)):
+                        node = node.right
+                    else:
+                        stack.append(node)
+                        node = node.left
+                elif hi is not None and (val > hi or (val == hi and not hi_inclusive)):
+                    node = node.left
+                else:
+                    stack.append(node)
+                    node = node.right
+            if not stack:
+                return
+            node = stack.pop()
+            val = node.val
+            if not reverse:
+                if hi is not None and (val > hi or (val == hi and not hi_inclusive)):
+                    return
+            elif lo is not None and (val < lo or (val == lo and not lo_inclusive)):
+                return
+            for _ in range(node.count):
+                yield val
+            node = node.left if reverse else node.right
+
+    def floor(self, key):
+        """
+        Return the largest key less than or equal to key.
+
+        Parameters:
+        key (int): The key to look up.
+
+        Returns:
+        int: The floor of key, or None if every key is larger.
+        """
+        with self._read_lock:
+            best = None
+            node = self.root
+            while node is not None:
+                if key < node.val:
+                    node = node.left
+                else:
+                    best = node.val
+                    if key == node.val:
+                        break
+                    node = node.right
+            return best
+
+    def ceiling(self, key):
+        """
+        Return the smallest key greater than or equal to key.
+
+        Parameters:
+        key (int): The key to look up.
+
+        Returns:
+        int: The ceiling of key, or None if every key is smaller.
+        """
+        with self._read_lock:
+            best = None
+            node = self.root
+            while node is not None:
+                if key > node.val:
+                    node = node.right
+                else:
+                    best = node.val
+                    if key == node.val:
+                        break
+                    node = node.left
+            return best
+
+    def split(self, key):
+        """
+        Split the tree around key.
+
+        The tree's nodes are reused by the result, so the tree is left empty
+        (copy-on-write trees are left intact).
+
+        Parameters:
+        key (int): The key to split around.
+
+        Returns:
+        tuple: (left, found, right) where left holds the keys smaller than key,
+            right the keys greater than key, and found tells whether key was present.
+        """
+        with self.tree_lock:
+            left, found, right = self._split(self.root, key)
+            if not self._copy_on_write:
+                self.root = None
+            logger.debug('Split tree at key: %s, Found: %s', key, found is not None)
+        return self._wrap(left), self._split_found(found), self._wrap(right)
+
+    @classmethod
+    def join(cls, left, key, right):
+        """
+        Join two trees around a separating key in O(|height(left) - height(right)|).
+
+        Plain trees are consumed (left empty); copy-on-write trees are left intact.
+
+        Parameters:
+        left (AVLTree): A tree whose keys are all smaller than key.
+        key (int): The separating key.
+        right (AVLTree): A tree whose keys are all greater than key.
+
+        Returns:
+        AVLTree: A tree holding the keys of left, key and the keys of right.
+
+        Raises:
+        ValueError: If the keys of left and right are not separated by key.
+        """
+        with cls._locked(left, right):
+            low = left._get_max_value_node(left.root)
+            high = right._get_min_value_node(right.root)
+            if (low is not None and not low.val < key) or (high is not None and not key < high.val):
+                raise ValueError("join requires max(left) < key < min(right)")
+            engine = cls._engine(left, right)
+            root = engine._join(left.root, engine.node_class(key), right.root)
+            cls._consume(left, right)
+        return engine._wrap(root)
+
+    def union(self, other):
+        """
+        Return a tree holding the keys present in either tree.
+
+        Uses the join-based algorithm in O(m log(n/m + 1)) for trees of sizes
+        m <= n. Both trees are treated as sets and plain trees are consumed.
+
+        Parameters:
+        other (AVLTree): The tree to merge with.
+
+        Returns:
+        AVLTree: The union of both trees.
+        """
+        return self._set_operation('_union', other)
+
+    def intersection(self, other):
+        """
+        Return a tree holding the keys present in both trees.
+
+        Parameters:
+        other (AVLTree): The tree to intersect with.
+
+        Returns:
+        AVLTree: The intersection of both trees.
+        """
+        return self._set_operation('_intersection', other)
+
+    def difference(self, other):
+        """
+        Return a tree holding the keys of this tree that are not in other.
+
+        Parameters:
+        other (AVLTree): The tree whose keys are removed.
+
+        Returns:
+        AVLTree: The difference of both trees.
+        """
+        return self._set_operation('_difference', other)
+
+    def _set_operation(self, operation, other):
+        with self._locked(self, other):
+            engine = self._engine(self, other)
+            total = self._get_size(self.root) + self._get_size(other.root)
+            root = getattr(engine, operation)(self.root, other.root)
+            self._consume(self, other)
+            logger.debug('Computed %s of %d keys', operation[1:], total)
+        return self._wrap(root)
+
+    def _wrap(self, root):
+        tree = type(self)()
+        tree.root = root
+        tree.pool = self.pool
+        return tree
+
+    @staticmethod
+    def _engine(first, second):
+        if first._copy_on_write != second._copy_on_write:
+            raise TypeError("cannot combine copy-on-write and plain trees")
+        return first
+
+    @staticmethod
+    def _consume(*trees):
+        for tree in trees:
+            if not tree._copy_on_write:
+                tree.root = None
+
+    @staticmethod
+    def _locked(first, second):
+        # Acquire both locks in a global order so a.union(b) and b.union(a) cannot deadlock
+        if first is second:
+            raise ValueError("cannot combine a tree with itself")
+        return _MultiLock(sorted((first.tree_lock, second.tree_lock), key=id))
+
+    def _own(self, node):
+        # Return a node that may be modified; copy-on-write subclasses return a copy
+        return node
+
+    def _join(self, left, node, right):
+        left_height = self._get_height(left)
+        right_height = self._get_height(right)
+        if left_height > right_height + 1:
+            top = self._own(left)
+            top.right = self._join(top.right, node, right)
+        elif right_height > left_height + 1:
+            top = self._own(right)
+            top.left = self._join(left, node, top.left)
+        else:
+            top = self._own(node)
+            top.left = left
+            top.right = right
+        self._update(top)
+        return self._rebalance(top)
+
+    def _join2(self, left, right):
+        if left is None:
+            return right
+        left, last = self._split_last(left)
+        return self._join(left, last, right)
+
+    def _split_last(self, node):
+        if node.right is None:
+            return node.left, node
+        rest, last = self._split_last(node.right)
+        return self._join(node.left, node, rest), last
+
+    def _split(self, node, key):
+        if node is None:
+            return None, None, None
+        if key < node.val:
+            left, found, right = self._split(node.left, key)
+            return left, found, self._join(right, node, node.right)
+        if key > node.val:
+            left, found, right = self._split(node.right, key)
+            return self._join(node.left, node, left), found, right
+        return node.left, node, node.right
+
+    def _union(self, a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        left, found, right = self._split(b, a.val)
+        a_left, a_right = a.left, a.right
+        if found is not None:
+            a = self._merge('_union', a, found)
+        return self._join(self._union(a_left, left), a, self._union(a_right, right))
+
+    def _intersection(self, a, b):
+        if a is None or b is None:
+            return None
+        left, found, right = self._split(b, a.val)
+        a_left, a_right = a.left, a.right
+        left = self._intersection(a_left, left)
+        right = self._intersection(a_right, right)
+        kept = None if found is None else self._merge('_intersection', a, found)
+        if kept is not None:
+            return self._join(left, kept, right)
+        return self._join2(left, right)
+
+    def _difference(self, a, b):
+        if a is None or b is None:
+            return a
+        left, found, right = self._split(a, b.val)
+        b_left, b_right = b.left, b.right
+        left = self._difference(left, b_left)
+        right = self._difference(right, b_right)
+        kept = None if found is None else self._merge('_difference', found, b)
+        if kept is not None:
+            return self._join(left, kept, right)
+        return self._join2(left, right)
+
+    def _merge(self, operation, node, other):
+        # Set-operation hook for a key held by both trees: node comes from the
+        # first tree, other from the second. Returns the node to keep, or None
+        # to drop the key. Plain trees are sets, so only difference drops it.
+        return None if operation == '_difference' else node
+
+    def _split_found(self, node):
+        # What split() reports for the node holding the split key (None if absent)
+        return node is not None
+
+    def _count_below(self, node, key, inclusive):
+        count = 0
+        while node is not None:
+            if key < node.val or (key == node.val and not inclusive):
+                node = node.left
+            else:
+                count += self._get_size(node.left) + node.count
+                node = node.right
+        return count
+
+    def _update(self, node):
+        node.height = 1 + max(self._get_height(node.left), self._get_height(node.right))
+        node.size = node.count + self._get_size(node.left) + self._get_size(node.right)
+
+    def _update_size(self, node):
+        # Like _update for a node whose height is known to be unchanged; hot on the
+        # tail of every retrace, so it skips the helper calls
+        left, right = node.left, node.right
+        node.size = (node.count + (left.size if left is not None else 0)
+                     + (right.size if right is not None else 0))
+
+    def _copy_payload(self, target, source):
+        # Copy what a node stores besides its links and augmentation;
+        # subclasses with richer node classes extend it
+        target.val = source.val
+
+    def _get_size(self, node):
+        if not node:
+            return 0
+        return node.size
 
     def _get_height(self, node):
         if not node:
@@ -143,26 +1082,30 @@ class AVLTree:
         return self._get_height(node.left) - self._get_height(node.right)
 
     def _right_rotate(self, y):
+        if self.metrics is not None:
+            self.metrics.rotations += 1
         x = y.left
         T2 = x.right
 
         x.right = y
         y.left = T2
 
-        y.height = 1 + max(self._get_height(y.left), self._get_height(y.right))
-        x.height = 1 + max(self._get_height(x.left), self._get_height(x.right))
+        self._update(y)
+        self._update(x)
 
         return x
 
     def _left_rotate(self, x):
+        if self.metrics is not None:
+            self.metrics.rotations += 1
         y = x.right
         T2 = y.left
 
         y.left = x
         x.right = T2
 
-        x.height = 1 + max(self._get_height(x.left), self._get_height(x.right))
-        y.height = 1 + max(self._get_height(y.left), self._get_height(y.right))
+        self._update(x)
+        self._update(y)
 
         return y
 
@@ -181,6 +1124,14 @@ class AVLTree:
 
         return node
 
+    def _get_max_value_node(self, node):
+        if node is None:
+            return None
+        current = node
+        while current.right is not None:
+            current = current.right
+        return current
+
     def _get_min_value_node(self, node):
         if node is None:
             return None  # Handle None input gracefully
@@ -189,40 +1140,386 @@ class AVLTree:
             current = current.left
         return current
 
-# Test the AVL tree implementation
-avl_tree = AVLTree()
-avl_tree._rebalance(None)  # Should handle None input gracefully
-avl_tree._get_min_value_node(None)  # Should handle None input gracefully
-print(avl_tree.search(10))  # Should return None
-
-avl_tree = AVLTree()
-avl_tree.insert(10)
-avl_tree._rebalance(avl_tree.root)  # Should handle single node tree correctly
-avl_tree._get_min_value_node(avl_tree.root)  # Should return the single node
-print(avl_tree.search(10).val)  # Should return the node with value 10
-
-avl_tree = AVLTree()
-avl_tree.insert(10)
-avl_tree.insert(20)
-avl_tree.insert(30)
-avl_tree._rebalance(avl_tree.root)  # Should rebalance the tree correctlyavl_tree = AVLTree()
-print(avl_tree.search(20).val)  # Should return the node with value 20
-
-avl_tree.insert(30)
-avl_tree.insert(20)
-avl_tree.insert(10)
-avl_tree._rebalance(avl_tree.root)  # Should perform right rotation
-print(avl_tree.search(20).val)  # Should return the node with value 20  
-
-avl_tree = AVLTree()
-avl_tree = AVLTree()
-avl_tree.insert(10)
-avl_tree.insert(20)
-avl_tree.insert(30)
-avl_tree._rebalance(avl_tree.root)  # Should perform left rotation
-print(avl_tree.search(20).val)  # Should return the node with value 20
+class AVLMap(AVLTree):
+    """
+    AVL tree mapping each distinct key to a payload.
+
+    Setting an existing key replaces its value instead of adding a node, and the
+    payload lives on the node, so lookups need no side dictionary.
+
+    Keys held by both maps keep the value from other in ``union`` (like
+    ``dict | dict``) and from this map in ``intersection``. ``split`` reports
+    the (key, value) pair it split around, or None, and ``join`` takes such a
+    pair as its separator.
+
+    :Example:
+
+    >>> shifts = AVLMap()
+    >>> shifts[9] = 'morning'
+    >>> shifts[9] = 'early'
+    >>> shifts.get(9), len(shifts)
+    ('early', 1)
+    """
+
+    node_class = AVLMapNode
+    _MISSING = object()
+
+    def __setitem__(self, key, value):
+        with self._instrumented(self.tree_lock, 'insert'):
+            self._put(key, value)
+            logger.debug('Set key: %s', key)
+
+    def __getitem__(self, key):
+        value = self.get(key, self._MISSING)
+        if value is self._MISSING:
+            raise KeyError(key)
+        return value
+
+    def __delitem__(self, key):
+        self.pop(key)
+
+    def get(self, key, default=None):
+        """
+        Return the value stored for key.
+
+        Parameters:
+        key (int): The key to look up.
+        default: Returned when the key is not present.
+
+        Returns:
+        The value for key, or default.
+        """
+        with self._instrumented(self._read_lock, 'search'):
+            node = self._search_iterative(key)
+            return default if node is None else node.value
+
+    def pop(self, key, default=_MISSING):
+        """
+        Remove key and return its value.
+
+        Parameters:
+        key (int): The key to remove.
+        default: Returned when the key is not present.
+
+        Returns:
+        The removed value, or default.
+
+        Raises:
+        KeyError: If the key is not present and no default is given.
+        """
+        with self._instrumented(self.tree_lock, 'delete'):
+            node = self._search_iterative(key)
+            if node is None:
+                if default is self._MISSING:
+                    raise KeyError(key)
+                return default
+            value = node.value
+            self._delete_key(key)
+            logger.debug('Popped key: %s', key)
+            return value
+
+    def items(self):
+        """
+        Lazily yield the (key, value) pairs in key order.
+
+        Returns:
+        generator of tuple: The stored pairs.
+        """
+        for node in self._iter_nodes(self.root):
+            yield node.val, node.value
+
+    def bulk_load(self, items, presorted=False):
+        """
+        Replace the contents of the map with (key, value) pairs in linear time.
+
+        When a key repeats, its last value wins.
+
+        Parameters:
+        items (iterable of tuple): The (key, value) pairs to load.
+        presorted (bool): Trust that the pairs are already in ascending key order.
+
+        Returns:
+        None
+        """
+        if not presorted:
+            items = sorted(items, key=lambda item: item[0])
+        unique = []
+        for item in items:
+            if unique and unique[-1][0] == item[0]:
+                unique[-1] = item
+            else:
+                unique.append(item)
+        super().bulk_load(unique, presorted=True)
+
+    def save(self, path):
+        """
+        Write the (key, value) pairs of the map to a snapshot file.
+
+        The header matches AVLTree snapshots with its own magic, followed by the
+        pairs in key order pickled as one list, so values may be any picklable
+        object. As with AVLTree.save, the file is replaced atomically.
+
+        Parameters:
+        path (str): The file to write.
+
+        Returns:
+        None
+        """
+        with self._read_lock:
+            items = list(self.items())
+        with atomic_write(path) as f:
+            f.write(SNAPSHOT_HEADER.pack(MAP_SNAPSHOT_MAGIC, len(items)))
+            pickle.dump(items, f, protocol=pickle.HIGHEST_PROTOCOL)
+        logger.debug('Saved %d pairs to %s', len(items), path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Build a map from a snapshot file written by save().
+
+        The values are unpickled, so only load files from a trusted source.
+
+        Parameters:
+        path (str): The file to read.
+        mmap (bool): Ignored; the pickled pairs are always read into memory.
+
+        Returns:
+        AVLMap: A perfectly balanced map holding the saved pairs.
+
+        Raises:
+        ValueError: If the file is not an AVLMap snapshot or holds a different
+            number of pairs than its header declares.
+        """
+        with open(path, 'rb') as f:
+            header = f.read(SNAPSHOT_HEADER.size)
+            if len(header) != SNAPSHOT_HEADER.size:
+                raise ValueError(f"{path} is not an AVLMap snapshot")
+            magic, count = SNAPSHOT_HEADER.unpack(header)
+            if magic != MAP_SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not an AVLMap snapshot")
+            try:
+                items = pickle.load(f)
+            except (EOFError, pickle.UnpicklingError) as e:
+                raise ValueError(f"{path} does not hold the {count} pairs its header declares") from e
+            if len(items) != count or f.read(1):
+                raise ValueError(f"{path} does not hold the {count} pairs its header declares")
+        tree = cls()
+        tree.bulk_load(items, presorted=True)
+        return tree
+
+    def _insert_key(self, key):
+        node, path = self._find_path(key)
+        if node is None:
+            self._attach(path, self._new_node(key))
+
+    def _put(self, key, value):
+        node, path = self._find_path(key)
+        if node is not None:
+            node.value = value
+            return
+
+        node = self._new_node(key)
+        node.value = value
+        self._attach(path, node)
+
+    @classmethod
+    def join(cls, left, item, right):
+        """
+        Join two maps around a separating (key, value) pair.
+
+        Parameters:
+        left (AVLMap): A map whose keys are all smaller than the separating key.
+        item (tuple): The separating (key, value) pair.
+        right (AVLMap): A map whose keys are all greater than the separating key.
+
+        Returns:
+        AVLMap: A map holding the pairs of left, item and the pairs of right.
+
+        Raises:
+        ValueError: If the keys of left and right are not separated by the key.
+        """
+        key, value = item
+        tree = super().join(left, key, right)
+        # The result is not shared yet, so setting the payload needs no lock
+        tree._search_iterative(key).value = value
+        return tree
+
+    def _make_node(self, item):
+        node = self._new_node(item[0])
+        node.value = item[1]
+        return node
+
+    def _copy_payload(self, target, source):
+        super()._copy_payload(target, source)
+        target.value = source.value
+
+    def _merge(self, operation, node, other):
+        if operation == '_union':
+            node.value = other.value
+        return super()._merge(operation, node, other)
+
+    def _split_found(self, node):
+        return None if node is None else (node.val, node.value)
+
+
+class AVLMultiset(AVLTree):
+    """
+    AVL tree storing each distinct key once together with its number of copies.
+
+    Duplicate-heavy streams only bump a counter, so they neither add nodes nor
+    grow the tree. ``len``, ``rank``, ``select``, ``count_range`` and ``range``
+    all count every copy.
+
+    Set operations combine counts like ``collections.Counter``: ``union`` keeps
+    the larger count of a key, ``intersection`` the smaller and ``difference``
+    subtracts, dropping keys that reach zero. ``split`` reports the number of
+    copies of the key it split around, and ``join`` adds one copy of its key.
+
+    :Example:
+
+    >>> tokens = AVLMultiset()
+    >>> tokens.batch_insert([3, 3, 3, 7])
+    >>> tokens.count(3), len(tokens)
+    (3, 4)
+    """
+
+    node_class = AVLMultisetNode
+
+    def count(self, key):
+        """
+        Return the number of copies of key.
+
+        Parameters:
+        key (int): The key to count.
+
+        Returns:
+        int: The multiplicity of key, 0 if it is not present.
+        """
+        with self._read_lock:
+            node = self._search_iterative(key)
+            return 0 if node is None else node.count
+
+    def bulk_load(self, keys, presorted=False):
+        """
+        Replace the contents of the multiset with keys in linear time.
+
+        Parameters:
+        keys (iterable of int): The keys to load, duplicates included.
+        presorted (bool): Trust that keys are already in ascending order.
+
+        Returns:
+        None
+        """
+        if not presorted:
+            keys = sorted(keys)
+        runs = []
+        for key in keys:
+            if runs and runs[-1][0] == key:
+                runs[-1][1] += 1
+            else:
+                runs.append([key, 1])
+        super().bulk_load(runs, presorted=True)
+
+    def _insert_key(self, key):
+        node, path = self._find_path(key)
+        if node is None:
+            self._attach(path, self._new_node(key))
+            return
+
+        node.count += 1
+        self._refresh_sizes(node, path)
+
+    def _delete_key(self, key):
+        node, path = self._find_path(key)
+        if node is None:
+            return
+        if node.count == 1:
+            super()._delete_key(key)
+            return
+
+        node.count -= 1
+        self._refresh_sizes(node, path)
+
+    def _refresh_sizes(self, node, path):
+        # The shape did not change, only the sizes from node up to the root
+        self._update(node)
+        for ancestor in reversed(path):
+            self._update(ancestor)
+
+    def _make_node(self, item):
+        node = self._new_node(item[0])
+        node.count = item[1]
+        return node
+
+    def _copy_payload(self, target, source):
+        super()._copy_payload(target, source)
+        target.count = source.count
+
+    def _merge(self, operation, node, other):
+        if operation == '_union':
+            node.count = max(node.count, other.count)
+        elif operation == '_intersection':
+            node.count = min(node.count, other.count)
+        elif node.count > other.count:
+            node.count -= other.count
+        else:
+            return None
+        return node
+
+    def _split_found(self, node):
+        return 0 if node is None else node.count
+
+
+class _MultiLock:
+    def __init__(self, locks):
+        self.locks = locks
+
+    def __enter__(self):
+        for lock in self.locks:
+            lock.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        for lock in reversed(self.locks):
+            lock.release()
+
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    # Test the AVL tree implementation
+    avl_tree = AVLTree()
+    avl_tree._rebalance(None)  # Should handle None input gracefully
+    avl_tree._get_min_value_node(None)  # Should handle None input gracefully
+    print(avl_tree.search(10))  # Should return None
+
+    avl_tree = AVLTree()
+    avl_tree.insert(10)
+    avl_tree._rebalance(avl_tree.root)  # Should handle single node tree correctly
+    avl_tree._get_min_value_node(avl_tree.root)  # Should return the single node
+    print(avl_tree.search(10).val)  # Should return the node with value 10
+
+    avl_tree = AVLTree()
+    avl_tree.insert(10)
+    avl_tree.insert(20)
+    avl_tree.insert(30)
+    avl_tree._rebalance(avl_tree.root)  # Should rebalance the tree correctlyavl_tree = AVLTree()
+    print(avl_tree.search(20).val)  # Should return the node with value 20
+
+    avl_tree.insert(30)
+    avl_tree.insert(20)
+    avl_tree.insert(10)
+    avl_tree._rebalance(avl_tree.root)  # Should perform right rotation
+    print(avl_tree.search(20).val)  # Should return the node with value 20  
+
+    avl_tree = AVLTree()
+    avl_tree = AVLTree()
+    avl_tree.insert(10)
+    avl_tree.insert(20)
+    avl_tree.insert(30)
+    avl_tree._rebalance(avl_tree.root)  # Should perform left rotation
+    print(avl_tree.search(20).val)  # Should return the node with value 20
+
     avl_tree = AVLTree()
     print(avl_tree._get_min_value_node(None))  # Should handle None input gracefully
\ No newline at end of file
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+import threading
+import logging
+import mmap as mmap_module
+import os
+import struct
+from array import array
+
+from atomic_file import atomic_write
+
+logger = logging.getLogger(__name__)
+
+# Index 0 is a sentinel "nil" node with height 0, so child lookups never need a None check.
+NIL = 0
+
+# Node table file layout: magic, key typecode, slot count, root, size and free-list
+# head, followed by the keys, left, right and height arrays in native byte order
+TABLE_MAGIC = b'AVLA'
+TABLE_HEADER = struct.Struct('=4sc3xQqqq')
+
+
+class ArrayAVLTree:
+    """
+    AVL tree whose nodes live in parallel typed arrays instead of Python objects.
+
+    Each node is an index into the ``keys``, ``left``, ``right`` and ``height`` arrays,
+    costing 17 bytes per key with the default int64 keys. Deleted slots are kept on a
+    free-list (threaded through ``left``) and reused by later inserts.
+
+    Parameters:
+    typecode (str): The array typecode used for the keys, 'q' (int64) by default.
+    """
+
+    def __init__(self, typecode='q'):
+        self.keys = array(typecode, [0])
+        self.left = array('i', [NIL])
+        self.right = array('i', [NIL])
+        self.height = array('b', [0])
+        self.root = NIL
+        self.size = 0
+        self._free = NIL
+        self.tree_lock = threading.RLock()
+
+    def __len__(self):
+        return self.size
+
+    def insert(self, key):
+        """
+        Insert a key into the AVL tree.
+
+        Parameters:
+        key (int): The key to be inserted into the tree.
+
+        Returns:
+        None
+        """
+        with self.tree_lock:
+            self._insert(key)
+            logger.debug('Inserted key: %s', key)
+
+    def delete(self, key):
+        """
+        Delete a node with the specified key from the AVL tree.
+
+        Parameters:
+        key (int): The key of the node to be deleted.
+
+        Returns:
+        None
+        """
+        with self.tree_lock:
+            self._delete(key)
+            logger.debug('Deleted key: %s', key)
+
+    def search(self, key):
+        """
+        Search for a key in the AVL tree.
+
+        Parameters:
+        key (int): The key to search for in the tree.
+
+        Returns:
+        int: The stored key, or None if the key is not found.
+        """
+        with self.tree_lock:
+            index = self._search(key)
+            logger.debug('Searched for key: %s, Found: %s', key, index != NIL)
+            return self.keys[index] if index != NIL else None
+
+    def batch_insert(self, keys):
+        """
+        Perform batch insertions of keys into the AVL tree.
+
+        Parameters:
+        keys (list of int): The keys to be inserted into the tree.
+
+        Returns:
+        None
+        """
+        trace = logger.isEnabledFor(logging.DEBUG)
+        with self.tree_lock:
+            for key in keys:
+                self._insert(key)
+                if trace:
+                    logger.debug('Batch inserted key: %s', key)
+
+    def batch_delete(self, keys):
+        """
+        Perform batch deletions of keys from the AVL tree.
+
+        Parameters:
+        keys (list of int): The keys of the nodes to be deleted.
+
+        Returns:
+        None
+        """
+        trace = logger.isEnabledFor(logging.DEBUG)
+        with self.tree_lock:
+            for key in keys:
+                self._delete(key)
+                if trace:
+                    logger.debug('Batch deleted key: %s', key)
+
+    def bulk_load(self, keys, presorted=False):
+        """
+        Replace the contents of the tree with a perfectly balanced tree built from keys.
+
+        Slot i + 1 holds the i-th smallest key, so the node table is filled in linear time.
+
+        Parameters:
+        keys (iterable of int): The keys to load into the tree.
+        presorted (bool): Trust that keys are already in ascending order.
+
+        Returns:
+        None
+        """
+        if not presorted:
+            keys = sorted(keys)
+        with self.tree_lock:
+            self.keys = array(self.keys.typecode, [0])
+            self.keys.extend(keys)
+            n = len(self.keys) - 1
+            self.left = array('i', [NIL]) * (n + 1)
+            self.right = array('i', [NIL]) * (n + 1)
+            self.height = array('b', [0]) * (n + 1)
+            self.root = self._build_balanced(1, n + 1)
+            self.size = n
+            self._free = NIL
+            logger.debug('Bulk loaded %d keys', n)
+
+    @classmethod
+    def from_iterable(cls, keys, presorted=False, typecode='q'):
+        """
+        Build a new array-backed AVL tree from an iterable of keys in linear time.
+
+        Parameters:
+        keys (iterable of int): The keys to load into the tree.
+        presorted (bool): Trust that keys are already in ascending order.
+        typecode (str): The array typecode used for the keys.
+
+        Returns:
+        ArrayAVLTree: A perfectly balanced tree holding all keys.
+        """
+        tree = cls(typecode)
+        tree.bulk_load(keys, presorted=presorted)
+        return tree
+
+    def nbytes(self):
+        """
+        Return the number of bytes held by the node arrays.
+
+        Returns:
+        int: The combined buffer size of the node arrays, free slots included.
+        """
+        return sum(a.itemsize * len(a) for a in (self.keys, self.left, self.right, self.height))
+
+    def save(self, path):
+        """
+        Write the node table to a binary file.
+
+        The table goes to a temporary file first, so a failed save leaves any
+        earlier table at path untouched.
+
+        Parameters:
+        path (str): The file to write.
+
+        Returns:
+        None
+        """
+        with self.tree_lock:
+            with atomic_write(path) as f:
+                f.write(TABLE_HEADER.pack(TABLE_MAGIC, self.keys.typecode.encode(), len(self.keys),
+                                          self.root, self.size, self._free))
+                for column in (self.keys, self.left, self.right, self.height):
+                    column.tofile(f)
+            logger.debug('Saved %d keys to %s', self.size, path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Load a node table written by save().
+
+        The table is restored as-is, free-list included, so no node is touched and
+        nothing is rebalanced: loading is a straight copy of each column.
+
+        Parameters:
+        path (str): The file to read.
+        mmap (bool): Memory-map the file and copy each column straight from the
+            mapping instead of reading it through the file object.
+
+        Returns:
+        ArrayAVLTree: The restored tree.
+
+        Raises:
+        ValueError: If the file is not an ArrayAVLTree node table or its length
+            does not match the header.
+        """
+        with open(path, 'rb') as f:
+            header = f.read(TABLE_HEADER.size)
+            if len(header) != TABLE_HEADER.size:
+                raise ValueError(f"{path} is not an ArrayAVLTree node table")
+            magic, typecode, slots, root, size, free = TABLE_HEADER.unpack(header)
+            if magic != TABLE_MAGIC:
+                raise ValueError(f"{path} is not an ArrayAVLTree node table")
+            tree = cls(typecode.decode())
+            columns = [array(tree.keys.typecode), array('i'), array('i'), array('b')]
+            expected = TABLE_HEADER.size + slots * sum(column.itemsize for column in columns)
+            if os.fstat(f.fileno()).st_size != expected:
+                raise ValueError(f"{path} does not hold the {slots} slots its header declares")
+            if mmap:
+                with mmap_module.mmap(f.fileno(), 0, access=mmap_module.ACCESS_READ) as mapped:
+                    with memoryview(mapped) as view:
+                        offset = TABLE_HEADER.size
+                        for column in columns:
+                            end = offset + slots * column.itemsize
+                            column.frombytes(view[offset:end])
+                            offset = end
+            else:
+                for column in columns:
+                    column.fromfile(f, slots)
+        tree.keys, tree.left, tree.right, tree.height = columns
+        tree.root, tree.size, tree._free = root, size, free
+        return tree
+
+    def _build_balanced(self, lo, hi):
+        if lo >= hi:
+            return NIL
+
+        mid = (lo + hi) // 2
+        self.left[mid] = self._build_balanced(lo, mid)
+        self.right[mid] = self._build_balanced(mid + 1, hi)
+        self._update(mid)
+        return mid
+
+    def _new_node(self, key):
+        index = self._free
+        if index != NIL:
+            self._free = self.left[index]
+            self.keys[index] = key
+            self.left[index] = NIL
+            self.right[index] = NIL
+            self.height[index] = 1
+        else:
+            index = len(self.keys)
+            self.keys.append(key)
+            self.left.append(NIL)
+            self.right.append(NIL)
+            self.height.append(1)
+        self.size += 1
+        return index
+
+    def _free_node(self, index):
+        self.left[index] = self._free
+        self.right[index] = NIL
+        self.height[index] = 0
+        self._free = index
+        self.size -= 1
+
+    def _insert(self, key):
+        keys, left, right = self.keys, self.left, self.right
+        path = []
+        node = self.root
+        while node != NIL:
+            path.append(node)
+            node = left[node] if key < keys[node] else right[node]
+
+        new_node = self._new_node(key)
+        if not path:
+            self.root = new_node
+            return
+
+        parent = path[-1]
+        if key < keys[parent]:
+            left[parent] = new_node
+        else:
+            right[parent] = new_node
+        self._retrace(path)
+
+    def _delete(self, key):
+        keys, left, right = self.keys, self.left, self.right
+        path = []
+        node = self.root
+        while node != NIL:
+            if key < keys[node]:
+                path.append(node)
+                node = left[node]
+            elif key > keys[node]:
+                path.append(node)
+                node = right[node]
+            else:
+                break
+
+        if node == NIL:
+            return
+
+        if left[node] != NIL and right[node] != NIL:
+            # Copy the in-order successor into this slot and unlink the successor instead
+            path.append(node)
+            successor = right[node]
+            while left[successor] != NIL:
+                path.append(successor)
+                successor = left[successor]
+            keys[node] = keys[successor]
+            node, child = successor, right[successor]
+        else:
+            child = left[node] if left[node] != NIL else right[node]
+
+        self._replace_child(path[-1] if path else NIL, node, child)
+        self._free_node(node)
+        self._retrace(path)
+
+    def _search(self, key):
+        keys, left, right = self.keys, self.left, self.right
+        node = self.root
+        while node != NIL and keys[node] != key:
+            node = left[node] if key < keys[node] else right[node]
+        return node
+
+    def _replace_child(self, parent, old, new):
+        if parent == NIL:
+            self.root = new
+        elif self.left[parent] == old:
+            self.left[parent] = new
+        else:
+            self.right[parent] = new
+
+    def _retrace(self, path):
+        height = self.height
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            old_height = height[node]
+            self._update(node)
+            subtree = self._rebalance(node)
+            if subtree != node:
+                self._replace_child(path[i - 1] if i else NIL, node, subtree)
+            if height[subtree] == old_height:
+                break
+
+    def _update(self, node):
+        height = self.height
+        height[node] = 1 + max(height[self.left[node]], height[self.right[node]])
+
+    def _get_balance(self, node):
+        return self.height[self.left[node]] - self.height[self.right[node]]
+
+    def _right_rotate(self, y):
+        left, right = self.left, self.right
+        x = left[y]
+        left[y] = right[x]
+        right[x] = y
+        self._update(y)
+        self._update(x)
+        return x
+
+    def _left_rotate(self, x):
+        left, right = self.left, self.right
+        y = right[x]
+        right[x] = left[y]
+        left[y] = x
+        self._update(x)
+        self._update(y)
+        return y
+
+    def _rebalance(self, node):
+        balance = self._get_balance(node)
+
+        if balance > 1:
+            if self._get_balance(self.left[node]) < 0:
+                self.left[node] = self._left_rotate(self.left[node])
+            return self._right_rotate(node)
+
+        if balance < -1:
+            if self._get_balance(self.right[node]) > 0:
+                self.right[node] = self._right_rotate(self.right[node])
+            return self._left_rotate(node)
+
+        return node
+
+
+# Example usage
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    tree = ArrayAVLTree.from_iterable([30, 10, 20])
+    tree.insert(40)
+    tree.delete(10)
+    print(tree.search(20))  # Should return 20
+    print(tree.search(10))  # Should return None
+    print(len(tree), tree.nbytes())
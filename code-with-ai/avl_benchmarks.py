@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the AVL tree in avl.py.
+
+Run from this directory with ``python avl_benchmarks.py``.
+"""
+import os
+import random
+import tempfile
+import threading
+import time
+import timeit
+from array import array
+
+from avl import AVLMap, AVLMetrics, AVLMultiset, AVLNode, AVLTree
+from avl_array import ArrayAVLTree
+from avl_snapshot import SnapshotAVLTree
+from bench_utils import fill_drain, traced_bytes
+from node_pool import NodePool
+from sharded_avl import ShardedAVLTree
+
+
+def bench_bulk_load(n=200_000, repeat=3):
+    keys = random.sample(range(n * 10), n)
+    sorted_keys = sorted(keys)
+
+    def batch():
+        tree = AVLTree()
+        tree.batch_insert(keys)
+
+    batch_time = min(timeit.repeat(batch, number=1, repeat=repeat))
+    bulk_time = min(timeit.repeat(lambda: AVLTree.from_iterable(keys), number=1, repeat=repeat))
+    presorted_time = min(timeit.repeat(
+        lambda: AVLTree.from_iterable(sorted_keys, presorted=True), number=1, repeat=repeat))
+
+    print(f'Build of {n} keys:')
+    print(f'  batch_insert:                  {batch_time:.3f} s')
+    print(f'  from_iterable:                 {bulk_time:.3f} s ({batch_time / bulk_time:.1f}x)')
+    print(f'  from_iterable(presorted=True): {presorted_time:.3f} s ({batch_time / presorted_time:.1f}x)')
+
+
+def bench_engines(n=100_000, repeat=3):
+    keys = random.sample(range(n * 10), n)
+
+    def run(iterative):
+        tree = AVLTree(iterative=iterative)
+        insert = timeit.timeit(lambda: [tree.insert(k) for k in keys], number=1)
+        search = min(timeit.repeat(lambda: [tree.search(k) for k in keys], number=1, repeat=repeat))
+        delete = timeit.timeit(lambda: [tree.delete(k) for k in keys], number=1)
+        return insert, search, delete
+
+    print(f'Per-op latency over {n} keys (recursive -> iterative):')
+    for name, before, after in zip(('insert', 'search', 'delete'), run(False), run(True)):
+        print(f'  {name:<6}: {before / n * 1e6:.2f} us -> {after / n * 1e6:.2f} us')
+
+
+def bench_memory(n=1_000_000):
+    keys = random.sample(range(2**40), n)
+    keys.sort()
+
+    print(f'Memory per key for {n} int64 keys:')
+    _, object_bytes = traced_bytes(lambda: AVLTree.from_iterable(keys, presorted=True))
+    print(f'  AVLTree (__slots__ nodes): {object_bytes / n:.1f} bytes/key, plus the int objects it references')
+    # payload slots live on node subclasses, so only maps and multisets pay for them
+    pairs = [(key, None) for key in keys]
+    _, map_bytes = traced_bytes(lambda: AVLMap.from_iterable(pairs, presorted=True))
+    print(f'  AVLMap (value slot):       {map_bytes / n:.1f} bytes/key')
+    _, multiset_bytes = traced_bytes(lambda: AVLMultiset.from_iterable(keys, presorted=True))
+    print(f'  AVLMultiset (count slot):  {multiset_bytes / n:.1f} bytes/key')
+    tree, array_bytes = traced_bytes(lambda: ArrayAVLTree.from_iterable(keys, presorted=True))
+    print(f'  ArrayAVLTree:              {array_bytes / n:.1f} bytes/key ({tree.nbytes() / n:.1f} in node arrays)')
+
+
+def _read_throughput(tree, keys, readers, writers, duration):
+    stop = threading.Event()
+    reads = [0] * readers
+
+    def reader(slot):
+        search = tree.search
+        count = 0
+        while not stop.is_set():
+            for key in random.sample(keys, 100):
+                search(key)
+            count += 100
+        reads[slot] = count
+
+    def writer():
+        while not stop.is_set():
+            key = random.randrange(len(keys) * 10)
+            tree.insert(key)
+            tree.delete(key)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(reads) / duration
+
+
+def bench_concurrent_reads(n=100_000, readers=4, duration=2.0):
+    keys = random.sample(range(n * 10), n)
+
+    print(f'Read throughput, {readers} reader threads over {n} keys:')
+    for writers in (0, 1, 4):
+        locked = _read_throughput(AVLTree.from_iterable(keys), keys, readers, writers, duration)
+        snapshot = _read_throughput(SnapshotAVLTree.from_iterable(keys), keys, readers, writers, duration)
+        print(f'  {writers} writers: RLock {locked:,.0f} reads/s, snapshot {snapshot:,.0f} reads/s')
+
+
+def bench_union(n=200_000, m=100_000):
+    big = random.sample(range(n * 10), n)
+    small = random.sample(range(n * 10), m)
+
+    tree = AVLTree.from_iterable(big)
+    one_by_one = timeit.timeit(lambda: tree.batch_insert(small), number=1)
+
+    tree, other = AVLTree.from_iterable(big), AVLTree.from_iterable(small)
+    joined = timeit.timeit(lambda: tree.union(other), number=1)
+
+    # The least a process pool would cost: shipping the keys out as flat arrays and
+    # rebuilding the result nodes in this process, before any work in the workers
+    tree, other = AVLTree.from_iterable(big), AVLTree.from_iterable(small)
+    merged = sorted(set(big).union(small))
+
+    def ship_and_rebuild():
+        array('q', (node.val for node in tree._iter_nodes(tree.root)))
+        array('q', (node.val for node in other._iter_nodes(other.root)))
+        AVLTree.from_iterable(array('q', merged), presorted=True)
+    shipped = timeit.timeit(ship_and_rebuild, number=1)
+
+    print(f'Merging {m} keys into a tree of {n}:')
+    print(f'  batch_insert: {one_by_one * 1000:.1f} ms')
+    print(f'  union:        {joined * 1000:.1f} ms')
+    print(f'  process pool floor (flatten + rebuild): {shipped * 1000:.1f} ms')
+
+
+def bench_snapshot_load(n=1_000_000):
+    keys = random.sample(range(2**40), n)
+    directory = tempfile.mkdtemp()
+    object_path = os.path.join(directory, 'tree.avlt')
+    table_path = os.path.join(directory, 'tree.avla')
+
+    insert_time = timeit.timeit(lambda: AVLTree().batch_insert(keys), number=1)
+    AVLTree.from_iterable(keys).save(object_path)
+    ArrayAVLTree.from_iterable(keys).save(table_path)
+
+    print(f'Bringing up a tree of {n} keys:')
+    print(f'  batch_insert:      {insert_time:.3f} s')
+    print(f'  AVLTree.load:      {timeit.timeit(lambda: AVLTree.load(object_path), number=1):.3f} s')
+    print(f'  ArrayAVLTree.load: {timeit.timeit(lambda: ArrayAVLTree.load(table_path), number=1):.3f} s')
+    for path in (object_path, table_path):
+        os.remove(path)
+    os.rmdir(directory)
+
+
+def bench_search_many(n=200_000, batches=(1_000, 20_000, 200_000)):
+    keys = random.sample(range(n * 10), n)
+    tree = AVLTree.from_iterable(keys)
+
+    print(f'Batched lookups against {n} keys (loop of search -> search_many):')
+    for size in batches:
+        probes = random.sample(keys, size // 2) + random.sample(range(n * 10), size - size // 2)
+        looped = timeit.timeit(lambda: [tree.search(k) for k in probes], number=1)
+        batched = timeit.timeit(lambda: tree.search_many(probes), number=1)
+        print(f'  {size:>7} probes: {looped * 1000:.1f} ms -> {batched * 1000:.1f} ms')
+
+
+def _write_throughput(tree, writers, n):
+    chunks = [random.sample(range(2**40), n // writers) for _ in range(writers)]
+
+    def writer(keys):
+        for i in range(0, len(keys), 100):
+            tree.batch_insert(keys[i:i + 100])
+
+    threads = [threading.Thread(target=writer, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return n / (time.perf_counter() - start)
+
+
+def bench_sharded_writes(n=200_000):
+    print(f'Write throughput inserting {n} keys in batches of 100:')
+    for writers in (1, 4, 16):
+        single = _write_throughput(AVLTree(), writers, n)
+        sharded = _write_throughput(ShardedAVLTree(split_threshold=10_000), writers, n)
+        print(f'  {writers:>2} writers: AVLTree {single:,.0f} keys/s, ShardedAVLTree {sharded:,.0f} keys/s')
+
+
+def bench_metrics(n=100_000):
+    keys = random.sample(range(n * 10), n)
+
+    def run(metrics):
+        tree = AVLTree(metrics=metrics)
+        insert = timeit.timeit(lambda: [tree.insert(k) for k in keys], number=1)
+        search = timeit.timeit(lambda: [tree.search(k) for k in keys], number=1)
+        return insert / n * 1e6, search / n * 1e6, tree.metrics
+
+    print(f'Instrumentation overhead over {n} keys:')
+    insert, search, _ = run(None)
+    print(f'  disabled:          insert {insert:.2f} us, search {search:.2f} us')
+    insert, search, metrics = run(AVLMetrics(sample_every=64))
+    print(f'  enabled (1 in 64): insert {insert:.2f} us, search {search:.2f} us')
+    print(f'  {metrics.report()}')
+
+
+def bench_node_pool(live=100_000, rounds=5):
+    print(f'{rounds} rounds of inserting then deleting {live} keys:')
+    keys = random.sample(range(live * 10), live)
+
+    def fill(tree):
+        for key in keys:
+            tree.insert(key)
+
+    def drain(tree):
+        for key in keys:
+            tree.delete(key)
+
+    fill_drain(lambda pool: AVLTree(pool=pool), fill, drain,
+               (None, NodePool(AVLNode, preallocate=live)), live, rounds, 'keys')
+
+
+if __name__ == "__main__":
+    bench_bulk_load()
+    bench_engines()
+    bench_memory()
+    bench_concurrent_reads()
+    bench_union()
+    bench_snapshot_load()
+    bench_search_many()
+    bench_sharded_writes()
+    bench_metrics()
+    bench_node_pool()
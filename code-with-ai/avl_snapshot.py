@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+import contextlib
+import logging
+
+from avl import AVLTree
+
+
+class SnapshotAVLTree(AVLTree):
+    """
+    AVL tree whose readers never block.
+
+    Writers still serialize on ``tree_lock``, but never modify a node that is
+    reachable from the published root: every insert or delete copies the nodes
+    on its search path (and any node a rotation touches) and then publishes the
+    new root with a single attribute assignment. ``search``, ``rank``,
+    ``select``, ``count_range`` and ``range`` read ``root`` once and run
+    lock-free against that immutable snapshot.
+
+    Set operations (``split``, ``join``, ``union``, ...) copy instead of reusing
+    input nodes, so their inputs stay intact.
+
+    :Example:
+
+    >>> tree = SnapshotAVLTree()
+    >>> tree.batch_insert([10, 20, 30])
+    >>> frozen = tree.snapshot()
+    >>> tree.delete(20)
+    >>> list(frozen.range(0, 100))
+    [10, 20, 30]
+    """
+
+    _copy_on_write = True
+
+    def __init__(self, metrics=None):
+        super().__init__(metrics=metrics)
+        self._read_lock = contextlib.nullcontext()
+
+    def snapshot(self):
+        """
+        Return an independent tree sharing the current version of this one.
+
+        This is O(1): both trees share all nodes, and later writes to either
+        tree copy the paths they change.
+
+        Returns:
+        SnapshotAVLTree: A tree holding the keys present at the time of the call.
+        """
+        tree = SnapshotAVLTree()
+        tree.root = self.root
+        return tree
+
+    def _insert_key(self, key):
+        self.root = self._insert_copy(self.root, key)
+
+    def _delete_key(self, key):
+        self.root = self._delete_copy(self.root, key)
+
+    def _insert_copy(self, node, key):
+        if node is None:
+            return self.node_class(key)
+
+        node = self._copy(node)
+        if key < node.val:
+            node.left = self._insert_copy(node.left, key)
+        else:
+            node.right = self._insert_copy(node.right, key)
+
+        self._update(node)
+        return self._rebalance(node)
+
+    def _delete_copy(self, node, key):
+        if node is None:
+            return None
+
+        if key < node.val:
+            left = self._delete_copy(node.left, key)
+            if left is node.left:
+                return node  # Key not found, keep sharing this subtree
+            node = self._copy(node)
+            node.left = left
+        elif key > node.val:
+            right = self._delete_copy(node.right, key)
+            if right is node.right:
+                return node
+            node = self._copy(node)
+            node.right = right
+        else:
+            if node.left is None:
+                return node.right
+            elif node.right is None:
+                return node.left
+
+            temp = self._get_min_value_node(node.right)
+            node = self._copy(node)
+            self._copy_payload(node, temp)
+            node.right = self._delete_min_copy(node.right)
+
+        self._update(node)
+        return self._rebalance(node)
+
+    def _delete_min_copy(self, node):
+        if node.left is None:
+            return node.right
+
+        node = self._copy(node)
+        node.left = self._delete_min_copy(node.left)
+        self._update(node)
+        return self._rebalance(node)
+
+    def _own(self, node):
+        return self._copy(node)
+
+    def _copy(self, node):
+        copy = self.node_class(node.val)
+        self._copy_payload(copy, node)
+        copy.left = node.left
+        copy.right = node.right
+        copy.height = node.height
+        copy.size = node.size
+        return copy
+
+    # Rotations may be handed a subtree that is still shared with published
+    # versions (e.g. the sibling side after a delete), so they copy both
+    # nodes they rewire.
+    def _right_rotate(self, y):
+        y = self._copy(y)
+        y.left = self._copy(y.left)
+        return super()._right_rotate(y)
+
+    def _left_rotate(self, x):
+        x = self._copy(x)
+        x.right = self._copy(x.right)
+        return super()._left_rotate(x)
+
+
+# Example usage
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    tree = SnapshotAVLTree()
+    tree.batch_insert([10, 20, 30])
+    frozen = tree.snapshot()
+    tree.delete(20)
+    print(list(frozen.range(0, 100)))  # Should print [10, 20, 30]
+    print(list(tree.range(0, 100)))  # Should print [10, 30]
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Measurement helpers shared by avl_benchmarks.py and linked_list_benchmarks.py.
+"""
+import gc
+import time
+import tracemalloc
+
+
+def traced_bytes(build):
+    """
+    Call build() and measure the memory it leaves allocated.
+
+    Parameters:
+    build (callable): Builds and returns the structure to measure.
+
+    Returns:
+    tuple: The result of build() and the number of bytes traced while it ran.
+    """
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def gc_pauses(run):
+    """
+    Time run() together with the garbage collections it triggers.
+
+    Parameters:
+    run (callable): The workload to time.
+
+    Returns:
+    tuple: The wall time of run() in seconds, the number of collections during
+    it and their total duration in seconds.
+    """
+    pauses = []
+
+    def callback(phase, info):
+        if phase == 'start':
+            pauses.append(time.perf_counter())
+        else:
+            pauses[-1] = time.perf_counter() - pauses[-1]
+
+    gc.collect()
+    gc.callbacks.append(callback)
+    try:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.callbacks.remove(callback)
+    return elapsed, len(pauses), sum(pauses)
+
+
+def fill_drain(make, fill, drain, pools, items, rounds, unit):
+    """
+    Time bursts of fills and drains on a structure built over each pool and print the results.
+
+    Without a pool every fill allocates items fresh nodes, so this is the
+    workload a node pool is meant to speed up.
+
+    Parameters:
+    make (callable): Builds an empty structure from a pool, or from None for no pool.
+    fill (callable): Adds items entries to the structure.
+    drain (callable): Removes them again.
+    pools (iterable): The pools to compare, None included.
+    items (int): The number of entries each fill adds.
+    rounds (int): The number of fills and drains per pool.
+    unit (str): What an entry is called in the printed throughput.
+    """
+    for pool in pools:
+        structure = make(pool)
+
+        def run():
+            for _ in range(rounds):
+                fill(structure)
+                drain(structure)
+
+        elapsed, collections, paused = gc_pauses(run)
+        print(f'  pool={pool is not None!s:<5}: {rounds * items / elapsed:>10,.0f} {unit}/s, '
+              f'{collections} collections, {paused * 1e3:.1f} ms in gc')
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+import threading
+import time
+from functools import wraps
+
+from datastructures import LinkedList, Node
+
+_MISSING = object()
+# separates positional from keyword arguments in memoize keys, like functools' kwd_mark
+_KWARGS_MARK = object()
+
+
+class CacheNode(Node):
+    __slots__ = ('key', 'expires', 'frequency')
+
+    def __init__(self, key, value, expires):
+        super().__init__(value)
+        self.key = key
+        self.expires = expires
+        self.frequency = 1
+
+
+class _Cache:
+    # Shared get/put logic. Entries live in doubly linked lists (the same Node
+    # and _link_last/_unlink primitives as LinkedList) with a key -> node dict on
+    # top, so every operation is O(1). Subclasses decide the eviction order
+    # through _add, _touch, _discard and _victim, all called under self.lock.
+
+    def __init__(self, max_size=1000, ttl=None):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self.lock:
+            return self._live(key) is not None
+
+    def get(self, key, default=None):
+        with self.lock:
+            node = self._live(key)
+            if node is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._touch(node)
+            return node.value
+
+    def put(self, key, value):
+        with self.lock:
+            expires = None if self.ttl is None else time.monotonic() + self.ttl
+            node = self._live(key)
+            if node is not None:
+                node.value = value
+                node.expires = expires
+                self._touch(node)
+                return
+            if len(self._entries) >= self.max_size:
+                # evict instead of raising MemoryError like LinkedList does
+                victim = self._victim()
+                self._remove(victim)
+                self.evictions += 1
+            node = CacheNode(key, value, expires)
+            self._entries[key] = node
+            self._add(node)
+
+    def pop(self, key, default=None):
+        with self.lock:
+            node = self._live(key)
+            if node is None:
+                return default
+            self._remove(node)
+            return node.value
+
+    def clear(self):
+        with self.lock:
+            self._entries.clear()
+            self._reset()
+
+    def stats(self):
+        with self.lock:
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+    def _live(self, key):
+        # the node for key, dropping it first if its ttl has passed
+        node = self._entries.get(key)
+        if node is not None and node.expires is not None and node.expires <= time.monotonic():
+            self._remove(node)
+            self.expirations += 1
+            return None
+        return node
+
+    def _remove(self, node):
+        del self._entries[node.key]
+        self._discard(node)
+
+
+class LRUCache(_Cache):
+    """
+    Thread-safe least recently used cache with O(1) get and put.
+
+    Entries are kept in a LinkedList ordered from least to most recently used;
+    a hit moves the entry to the tail and a full cache evicts the head.
+
+    Parameters:
+    max_size (int): The number of entries kept before the oldest is evicted.
+    ttl (float): Optional lifetime of an entry in seconds, counted from its last put.
+
+    :Example:
+
+    >>> cache = LRUCache(max_size=2)
+    >>> cache.put('a', 1); cache.put('b', 2)
+    >>> cache.get('a')
+    1
+    >>> cache.put('c', 3)  # evicts 'b', the least recently used entry
+    >>> cache.get('b') is None, cache.evictions
+    (True, 1)
+    """
+
+    def __init__(self, max_size=1000, ttl=None):
+        super().__init__(max_size, ttl)
+        self._order = LinkedList(max_size=max_size)
+
+    def _add(self, node):
+        self._order._link_last(node)
+
+    def _touch(self, node):
+        if node is not self._order.tail:
+            self._order._unlink(node)
+            self._order._link_last(node)
+
+    def _discard(self, node):
+        self._order._unlink(node)
+
+    def _victim(self):
+        return self._order.head
+
+    def _reset(self):
+        self._order = LinkedList(max_size=self.max_size)
+
+
+class LFUCache(_Cache):
+    """
+    Thread-safe least frequently used cache with O(1) get and put.
+
+    Entries are bucketed by access count in one LinkedList per frequency, and the
+    lowest non-empty frequency is tracked, so a full cache evicts the least
+    frequently used entry without scanning. Ties go to the least recently used.
+
+    Parameters:
+    max_size (int): The number of entries kept before one is evicted.
+    ttl (float): Optional lifetime of an entry in seconds, counted from its last put.
+
+    :Example:
+
+    >>> cache = LFUCache(max_size=2)
+    >>> cache.put('a', 1); cache.put('b', 2)
+    >>> cache.get('a'), cache.get('a')
+    (1, 1)
+    >>> cache.put('c', 3)  # evicts 'b', used least often
+    >>> 'b' in cache, 'a' in cache
+    (False, True)
+    """
+
+    def __init__(self, max_size=1000, ttl=None):
+        super().__init__(max_size, ttl)
+        self._buckets = {}
+        self._min_frequency = 0
+
+    def _bucket(self, frequency):
+        bucket = self._buckets.get(frequency)
+        if bucket is None:
+            bucket = self._buckets[frequency] = LinkedList(max_size=self.max_size)
+        return bucket
+
+    def _add(self, node):
+        node.frequency = 1
+        self._bucket(1)._link_last(node)
+        self._min_frequency = 1
+
+    def _touch(self, node):
+        self._discard(node)
+        if node.frequency == self._min_frequency and node.frequency not in self._buckets:
+            self._min_frequency += 1
+        node.frequency += 1
+        self._bucket(node.frequency)._link_last(node)
+
+    def _discard(self, node):
+        bucket = self._buckets[node.frequency]
+        bucket._unlink(node)
+        if bucket.size == 0:
+            del self._buckets[node.frequency]
+
+    def _victim(self):
+        if self._min_frequency not in self._buckets:
+            # a pop or expiry emptied the lowest bucket; rare, so a scan is fine
+            self._min_frequency = min(self._buckets)
+        return self._buckets[self._min_frequency].head
+
+    def _reset(self):
+        self._buckets = {}
+        self._min_frequency = 0
+
+
+def memoize(cache):
+    """
+    Decorator caching a function's results in the given cache.
+
+    The key is built from the positional and keyword arguments, which must be
+    hashable. None results are cached too, so give the cache a ttl when a
+    missing record may appear later, e.g. for database lookups.
+
+    Parameters:
+    cache (LRUCache or LFUCache): The cache holding the results.
+
+    Returns:
+    function: The decorator. Wrapped functions expose the cache as ``.cache``.
+
+    :Example:
+
+    >>> @memoize(LRUCache(max_size=128, ttl=60))
+    ... def square(x):
+    ...     return x * x
+    >>> square(4), square(4), square.cache.hits
+    (16, 16, 1)
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items())) if kwargs else args
+            result = cache.get(key, _MISSING)
+            if result is _MISSING:
+                # computed outside the lock; concurrent misses may both call func
+                result = func(*args, **kwargs)
+                cache.put(key, result)
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+# Example usage
+if __name__ == "__main__":
+    cache = LRUCache(max_size=2, ttl=30)
+    cache.put(1, 'one')
+    cache.put(2, 'two')
+    cache.get(1)
+    cache.put(3, 'three')
+    print(cache.stats())  # Should print 1 hit and 1 eviction
@@ -1,57 +1,705 @@
 import threading
+import time
+from collections import OrderedDict
+from queue import Empty, Full
 
 class Node:
+    __slots__ = ('value', 'prev', 'next')
+
     def __init__(self, value):
         self.value = value
+        self.prev = None
         self.next = None
 
+# position marker for "after the current tail", see LinkedList._splice
+_TAIL = object()
+
+class _Cursor:
+    # where a LinkedList iterator stopped: the last node it read, or None
+    # before the first chunk. The list moves it off nodes it unlinks.
+    __slots__ = ('node', 'forward')
+
+    def __init__(self, forward):
+        self.node = None
+        self.forward = forward
+
+def chain_length(head):
+    # number of distinct nodes reachable from head through next, and whether
+    # the chain loops back on itself. Brent's cycle detection: O(1) memory.
+    if head is None:
+        return 0, False
+    power = cycle = 1
+    tortoise, hare = head, head.next
+    while hare is not tortoise:
+        if hare is None:
+            break
+        if power == cycle:
+            # teleport the tortoise and double the search window
+            tortoise = hare
+            power *= 2
+            cycle = 0
+        hare = hare.next
+        cycle += 1
+    else:
+        # the cycle starts where two pointers cycle nodes apart first meet
+        tortoise = hare = head
+        for _ in range(cycle):
+            hare = hare.next
+        start = 0
+        while tortoise is not hare:
+            tortoise = tortoise.next
+            hare = hare.next
+            start += 1
+        return start + cycle, True
+
+    length = 0
+    while head is not None:
+        length += 1
+        head = head.next
+    return length, False
+
+def iter_chain(head):
+    # yields every node reachable from head once, stopping where a corrupted
+    # chain loops back; O(1) extra memory instead of a set of seen nodes
+    length, _ = chain_length(head)
+    for _ in range(length):
+        yield head
+        head = head.next
+
 class LinkedList:
-    def __init__(self, max_size=1000):
+    def __init__(self, max_size=1000, indexed=False, pool=None):
         self.head = None
+        self.tail = None
         self.size = 0
         self.max_size = max_size
         self.lock = threading.Lock()
+        # optional value -> nodes index making remove, `in` and move_to_end O(1).
+        # A value held once maps straight to its node; duplicated values map to
+        # an OrderedDict of their nodes in list order, so the first occurrence is
+        # always first. Measured overhead (linked_list_benchmarks.py): about 50
+        # bytes per element with unique values, 75 with heavily duplicated ones.
+        self._index = {} if indexed else None
+        # optional node_pool.NodePool of Node recycling the nodes of removed values
+        if pool is not None and pool.node_class is not Node:
+            raise ValueError("pool must hold Node objects")
+        self.pool = pool
+        # cursors of the iterators that are partway through a walk; unlinking
+        # a node moves any cursor on it back to an already visited node
+        self._cursors = set()
 
     def add(self, value):
+        self.append(value)
+
+    def append(self, value):
         # validate input data
-        if not isinstance(value, (int, float, str)):
-            raise ValueError("Value must be an int, float, or str")
+        self._validate(value)
 
         # add thread safety
         with self.lock:
-            if self.size >= self.max_size:
-                raise MemoryError("Exceeded maximum linked list size")
-            
-            new_node = Node(value)
+            self._check_capacity()
+            self._link_last(self._new_node(value))
+
+    def appendleft(self, value):
+        self._validate(value)
+
+        with self.lock:
+            self._check_capacity()
+            self._link_first(self._new_node(value))
+
+    def pop(self):
+        with self.lock:
+            if self.tail is None:
+                raise IndexError("pop from an empty linked list")
+            node = self.tail
+            self._unlink(node)
+            return self._release(node)
+
+    def popleft(self):
+        with self.lock:
             if self.head is None:
-                self.head = new_node
-            else:
-                current = self.head
-                while current.next:
-                    current = current.next
-                current.next = new_node
-            self.size += 1
+                raise IndexError("pop from an empty linked list")
+            node = self.head
+            self._unlink(node)
+            return self._release(node)
 
     def remove(self, value):
         with self.lock:
-            current = self.head
+            node = self._find(value)
+            if node is None:
+                return False
+            self._unlink(node)
+            self._release(node)
+            return True
+
+    def move_to_end(self, value):
+        # moves the first occurrence of value to the tail
+        with self.lock:
+            node = self._find(value)
+            if node is None:
+                return False
+            if node is not self.tail:
+                self._unlink(node)
+                self._link_last(node)
+            return True
+
+    def __contains__(self, value):
+        with self.lock:
+            return self._find(value) is not None
+
+    def find(self, value):
+        # first node holding value, or None; a position for splice and split_at
+        with self.lock:
+            return self._find(value)
+
+    def extend_list(self, other):
+        # moves every node of other to the end of this list in O(1), leaving
+        # other empty; O(len(other)) when this list is indexed
+        self._splice(_TAIL, other)
+
+    def splice(self, node, other):
+        # moves every node of other in after node (to the front when node is
+        # None) in O(1), leaving other empty. node must belong to this list. An
+        # indexed list pays O(len(other)) at either end and a rebuild elsewhere.
+        self._splice(node, other)
+
+    def _splice(self, node, other):
+        # node may be _TAIL, resolved under the lock so a concurrent pop or
+        # append cannot leave other's chain after a stale tail
+        if other is self:
+            raise ValueError("cannot splice a linked list into itself")
+        first, second = sorted((self, other), key=id)
+        with first.lock, second.lock:
+            if self.size + other.size > self.max_size:
+                raise MemoryError("Exceeded maximum linked list size")
+            if other.head is None:
+                return
+            if node is _TAIL:
+                node = self.tail
+            head, tail, count = other.head, other.tail, other.size
+            other._detach_chain(head, tail, count)
+            self._insert_chain(node, head, tail, count)
+
+    def split_at(self, node):
+        # detaches node and every node after it into a new list of the same kind.
+        # Counting the moved nodes walks outwards from node in both directions,
+        # so it costs the shorter side; an indexed list pays for the moved side.
+        with self.lock:
+            count = self._count_from(node)
+            tail = self.tail
+            self._detach_chain(node, tail, count)
+        rest = type(self)(max_size=self.max_size, indexed=self._index is not None, pool=self.pool)
+        with rest.lock:
+            rest._insert_chain(None, node, tail, count)
+        return rest
+
+    def __len__(self):
+        return self.size
+
+    def validate(self):
+        # checks head/tail, prev/next links and size in one pass, raising
+        # ValueError at the first inconsistency; a cycle shows up as a walk
+        # longer than size
+        with self.lock:
+            if self.head is not None and self.head.prev is not None:
+                raise ValueError("head has a previous node")
             previous = None
-            while current:
-                if current.value == value:
-                    if previous:
-                        previous.next = current.next
-                    else:
-                        self.head = current.next
-                    self.size -= 1
-                    return True
+            current = self.head
+            count = 0
+            while current is not None:
+                if current.prev is not previous:
+                    raise ValueError(f"node {count} does not link back to its predecessor")
+                count += 1
+                if count > self.size:
+                    raise ValueError(f"more than size={self.size} nodes reachable; the chain may loop")
                 previous = current
                 current = current.next
-            return False
+            if previous is not self.tail:
+                raise ValueError("tail is not the last reachable node")
+            if count != self.size:
+                raise ValueError(f"size is {self.size} but {count} nodes are linked")
 
-    def print_iteration(self):
+    def __iter__(self):
+        # weakly consistent and lock-free between chunks, see _walk. An
+        # iterator that is kept but never finished costs one cursor check per
+        # unlink until it is closed or garbage collected; it blocks nothing.
+        return self._walk(forward=True)
+
+    def __reversed__(self):
+        return self._walk(forward=False)
+
+    def to_list(self):
+        # consistent copy taken under one lock hold
         with self.lock:
+            values = []
+            current = self.head
+            while current:
+                values.append(current.value)
+                current = current.next
+            return values
+
+    def print_iteration(self):
+        # iterates in chunks, so a slow terminal no longer blocks writers
+        for value in self:
+            print(value, end=' ')
+        print()
+
+    def _validate(self, value):
+        if not isinstance(value, (int, float, str)):
+            raise ValueError("Value must be an int, float, or str")
+
+    def _check_capacity(self):
+        if self.size >= self.max_size:
+            raise MemoryError("Exceeded maximum linked list size")
+
+    def _walk(self, forward, chunk_size=256):
+        # weakly consistent iterator: copies up to chunk_size values per lock
+        # hold and yields them with the lock released. Values added, removed or
+        # moved meanwhile may or may not be seen; every other value is seen
+        # once. The cursor is registered only between the first and the last
+        # chunk, and writers keep it on a linked node (see _retreat_cursors), so
+        # removed nodes can go straight back to the pool.
+        cursor = _Cursor(forward)
+        try:
+            while True:
+                with self.lock:
+                    node = cursor.node
+                    if node is None:
+                        node = self.head if forward else self.tail
+                    else:
+                        node = node.next if forward else node.prev
+                    values = []
+                    while node is not None and len(values) < chunk_size:
+                        values.append(node.value)
+                        cursor.node = node
+                        node = node.next if forward else node.prev
+                    if node is None:
+                        self._cursors.discard(cursor)
+                    else:
+                        self._cursors.add(cursor)
+                yield from values
+                if node is None:
+                    return
+        finally:
+            # only this generator adds or removes its cursor, so the check
+            # needs no lock
+            if cursor in self._cursors:
+                with self.lock:
+                    self._cursors.discard(cursor)
+
+    def _count_from(self, node):
+        # caller holds self.lock; the number of nodes from node to the tail
+        ahead, behind = node, node.prev
+        moved = kept = 0
+        while True:
+            if ahead is None:
+                return moved
+            if behind is None:
+                return self.size - kept
+            moved += 1
+            ahead = ahead.next
+            kept += 1
+            behind = behind.prev
+
+    def _detach_chain(self, head, tail, count):
+        # caller holds self.lock; unlinks the count nodes from head to tail
+        if self._cursors:
+            self._retreat_cursors(head, tail)
+        if head.prev:
+            head.prev.next = tail.next
+        else:
+            self.head = tail.next
+        if tail.next:
+            tail.next.prev = head.prev
+        else:
+            self.tail = head.prev
+        head.prev = None
+        tail.next = None
+        self.size -= count
+        if self._index is not None:
+            if self.size == 0:
+                self._index = {}
+            else:
+                current = head
+                while current:
+                    self._unindex_node(current)
+                    current = current.next
+
+    def _insert_chain(self, after, head, tail, count):
+        # caller holds self.lock; links the count nodes from head to tail after
+        # the node after, or at the front when it is None
+        following = self.head if after is None else after.next
+        head.prev = after
+        tail.next = following
+        if after is None:
+            self.head = head
+        else:
+            after.next = head
+        if following is None:
+            self.tail = tail
+        else:
+            following.prev = tail
+        self.size += count
+        if self._index is None:
+            return
+        if following is None:
+            current = head
+            while current is not following:
+                self._index_node(current, last=True)
+                current = current.next
+        elif after is None:
+            current = tail
+            while current is not None:
+                self._index_node(current, last=False)
+                current = current.prev
+        else:
+            # duplicates must stay in list order, which a middle splice breaks
+            self._index = {}
             current = self.head
             while current:
-                print(current.value, end=' ')
+                self._index_node(current, last=True)
                 current = current.next
-            print()
+
+    def _retreat_cursors(self, head, tail):
+        # caller holds self.lock; the nodes from head to tail are about to be
+        # unlinked, so iterator cursors on them move to the neighbour their walk
+        # came from, which it has already passed. Walks the chain unless it is
+        # a single node, so moving nodes out costs O(count) while iterating.
+        if head is tail:
+            stranded = [cursor for cursor in self._cursors if cursor.node is head]
+        else:
+            cursors = {}
+            for cursor in self._cursors:
+                cursors.setdefault(id(cursor.node), []).append(cursor)
+            stranded = []
+            node = head
+            while True:
+                stranded.extend(cursors.get(id(node), ()))
+                if node is tail:
+                    break
+                node = node.next
+        for cursor in stranded:
+            cursor.node = head.prev if cursor.forward else tail.next
+
+    def _find(self, value):
+        # first node holding value, or None; caller holds self.lock
+        if self._index is not None:
+            entry = self._index.get(value)
+            if entry is None or isinstance(entry, Node):
+                return entry
+            return next(iter(entry))
+        current = self.head
+        while current:
+            if current.value == value:
+                return current
+            current = current.next
+        return None
+
+    def _index_node(self, node, last):
+        entry = self._index.get(node.value)
+        if entry is None:
+            self._index[node.value] = node
+            return
+        if isinstance(entry, Node):
+            entry = self._index[node.value] = OrderedDict.fromkeys((entry,))
+        entry[node] = None
+        if not last:
+            entry.move_to_end(node, last=False)
+
+    def _new_node(self, value):
+        if self.pool is None:
+            return Node(value)
+        return self.pool.acquire(value)
+
+    def _release(self, node):
+        # hands an unlinked node back to the pool and returns its value
+        value = node.value
+        if self.pool is not None:
+            self.pool.release(node)
+        return value
+
+    def _link_last(self, node):
+        # caller holds self.lock
+        node.prev = self.tail
+        node.next = None
+        if self.tail is None:
+            self.head = node
+        else:
+            self.tail.next = node
+        self.tail = node
+        self.size += 1
+        if self._index is not None:
+            self._index_node(node, last=True)
+
+    def _link_first(self, node):
+        # caller holds self.lock
+        node.prev = None
+        node.next = self.head
+        if self.head is None:
+            self.tail = node
+        else:
+            self.head.prev = node
+        self.head = node
+        self.size += 1
+        if self._index is not None:
+            self._index_node(node, last=False)
+
+    def _unlink(self, node):
+        # caller holds self.lock
+        if self._cursors:
+            self._retreat_cursors(node, node)
+        if node.prev:
+            node.prev.next = node.next
+        else:
+            self.head = node.next
+        if node.next:
+            node.next.prev = node.prev
+        else:
+            self.tail = node.prev
+        self.size -= 1
+        if self._index is not None:
+            self._unindex_node(node)
+
+    def _unindex_node(self, node):
+        entry = self._index[node.value]
+        if isinstance(entry, Node):
+            del self._index[node.value]
+        else:
+            del entry[node]
+            if len(entry) == 1:
+                self._index[node.value] = next(iter(entry))
+
+class BoundedLinkedQueue(LinkedList):
+    # producer/consumer hand-off: put blocks while max_size values are queued
+    # and get blocks while the queue is empty, instead of raising. Both
+    # conditions share self.lock, so the LinkedList methods stay usable and
+    # wake waiters as well.
+    def __init__(self, max_size=1000, indexed=False, pool=None):
+        super().__init__(max_size, indexed, pool)
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+
+    def put(self, value, block=True, timeout=None):
+        self._validate(value)
+
+        with self.not_full:
+            if not self._wait(self.not_full, self._has_room, block, timeout):
+                raise Full("Linked queue is full")
+            self._link_last(self._new_node(value))
+
+    def get(self, block=True, timeout=None):
+        with self.not_empty:
+            if not self._wait(self.not_empty, self._has_items, block, timeout):
+                raise Empty("Linked queue is empty")
+            node = self.head
+            self._unlink(node)
+            return self._release(node)
+
+    def put_many(self, values, timeout=None):
+        # takes the lock once per run of free slots rather than once per value;
+        # on timeout the values put so far stay queued
+        values = list(values)
+        for value in values:
+            self._validate(value)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        position = 0
+        while position < len(values):
+            with self.not_full:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if not self._wait(self.not_full, self._has_room, True, remaining):
+                    raise Full(f"Linked queue is full after putting {position} of {len(values)} values")
+                end = min(len(values), position + self.max_size - self.size)
+                for value in values[position:end]:
+                    self._link_last(self._new_node(value))
+                position = end
+
+    def get_many(self, max_items, block=True, timeout=None):
+        # waits for at least one value, then takes up to max_items at once
+        with self.not_empty:
+            if not self._wait(self.not_empty, self._has_items, block, timeout):
+                raise Empty("Linked queue is empty")
+            values = []
+            while self.head is not None and len(values) < max_items:
+                node = self.head
+                self._unlink(node)
+                values.append(self._release(node))
+            return values
+
+    def _has_room(self):
+        return self.size < self.max_size
+
+    def _has_items(self):
+        return self.head is not None
+
+    def _wait(self, condition, predicate, block, timeout):
+        # caller holds self.lock
+        if not block:
+            return predicate()
+        return condition.wait_for(predicate, timeout)
+
+    def _link_last(self, node):
+        super()._link_last(node)
+        self.not_empty.notify()
+
+    def _link_first(self, node):
+        super()._link_first(node)
+        self.not_empty.notify()
+
+    def _unlink(self, node):
+        super()._unlink(node)
+        self.not_full.notify()
+
+    def _insert_chain(self, after, head, tail, count):
+        super()._insert_chain(after, head, tail, count)
+        self.not_empty.notify(count)
+
+    def _detach_chain(self, head, tail, count):
+        super()._detach_chain(head, tail, count)
+        self.not_full.notify(count)
+
+class _Chunk:
+    __slots__ = ('values', 'prev', 'next')
+
+    def __init__(self, values):
+        self.values = values
+        self.prev = None
+        self.next = None
+
+class UnrolledLinkedList:
+    # same API and max_size semantics as LinkedList, but every node holds up to
+    # chunk_size values in a list. Iteration follows one pointer per chunk and
+    # the per-value cost drops from a Node object to a list slot: about 10 bytes
+    # per value instead of 96 at the default chunk_size (linked_list_benchmarks.py).
+    def __init__(self, max_size=1000, chunk_size=64):
+        if chunk_size < 2:
+            raise ValueError("chunk_size must be at least 2")
+        self.head = None
+        self.tail = None
+        self.size = 0
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+        self.lock = threading.Lock()
+
+    def add(self, value):
+        self.append(value)
+
+    def append(self, value):
+        self._validate(value)
+
+        with self.lock:
+            self._check_capacity()
+            if self.tail is None or len(self.tail.values) >= self.chunk_size:
+                self._link_chunk(_Chunk([]), after=self.tail)
+            self.tail.values.append(value)
+            self.size += 1
+
+    def appendleft(self, value):
+        self._validate(value)
+
+        with self.lock:
+            self._check_capacity()
+            if self.head is None or len(self.head.values) >= self.chunk_size:
+                self._link_chunk(_Chunk([]), after=None)
+            self.head.values.insert(0, value)
+            self.size += 1
+
+    def pop(self):
+        with self.lock:
+            if self.tail is None:
+                raise IndexError("pop from an empty linked list")
+            chunk = self.tail
+            value = chunk.values.pop()
+            self._removed_from(chunk)
+            return value
+
+    def popleft(self):
+        with self.lock:
+            if self.head is None:
+                raise IndexError("pop from an empty linked list")
+            chunk = self.head
+            value = chunk.values.pop(0)
+            self._removed_from(chunk)
+            return value
+
+    def remove(self, value):
+        # removes the first occurrence of value
+        with self.lock:
+            chunk = self.head
+            while chunk:
+                try:
+                    index = chunk.values.index(value)
+                except ValueError:
+                    chunk = chunk.next
+                    continue
+                del chunk.values[index]
+                self._removed_from(chunk)
+                return True
+            return False
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, value):
+        with self.lock:
+            chunk = self.head
+            while chunk:
+                if value in chunk.values:
+                    return True
+                chunk = chunk.next
+            return False
+
+    def __iter__(self):
+        # like __reversed__ it must not race with writers
+        chunk = self.head
+        while chunk:
+            yield from chunk.values
+            chunk = chunk.next
+
+    def __reversed__(self):
+        chunk = self.tail
+        while chunk:
+            yield from reversed(chunk.values)
+            chunk = chunk.prev
+
+    def print_iteration(self):
+        with self.lock:
+            print(*self)
+
+    _validate = LinkedList._validate
+    _check_capacity = LinkedList._check_capacity
+
+    def _removed_from(self, chunk):
+        # caller holds self.lock; drops empty chunks and merges a chunk that fell
+        # below half full into its successor when both fit in one chunk
+        self.size -= 1
+        if not chunk.values:
+            self._unlink_chunk(chunk)
+            return
+        following = chunk.next
+        if (following is not None and len(chunk.values) < self.chunk_size // 2
+                and len(chunk.values) + len(following.values) <= self.chunk_size):
+            chunk.values.extend(following.values)
+            self._unlink_chunk(following)
+
+    def _link_chunk(self, chunk, after):
+        # links chunk after the given chunk, or at the head when after is None
+        chunk.prev = after
+        chunk.next = self.head if after is None else after.next
+        if chunk.next is None:
+            self.tail = chunk
+        else:
+            chunk.next.prev = chunk
+        if after is None:
+            self.head = chunk
+        else:
+            after.next = chunk
+
+    def _unlink_chunk(self, chunk):
+        if chunk.prev:
+            chunk.prev.next = chunk.next
+        else:
+            self.head = chunk.next
+        if chunk.next:
+            chunk.next.prev = chunk.prev
+        else:
+            self.tail = chunk.prev
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+from avl import AVLNode, AVLTree
+
+# Interval snapshots share the AVLTree header; each interval is stored as its
+# start and end, two native int64 values
+INTERVAL_SNAPSHOT_MAGIC = b'AVLI'
+
+
+class IntervalNode(AVLNode):
+    __slots__ = ('max_end',)
+
+    def __init__(self, key):
+        super().__init__(key)
+        self.max_end = key[1]
+
+
+class IntervalAVLTree(AVLTree):
+    """
+    AVL tree of closed intervals keyed by (start, end).
+
+    Every node also tracks the largest end point in its subtree (``max_end``),
+    maintained by ``_update`` through inserts, deletes and rotations. Overlap
+    queries prune every subtree whose ``max_end`` falls before the query and stop
+    at the first start after it, so they only visit one search path plus the
+    ancestors of the k reported intervals: O(log n + k) for clustered results,
+    O(k log n) at worst.
+
+    Start and end can be any comparable values, e.g. the ``time_in``/``time_out``
+    timestamps of the employee schedule. ``save`` and ``load`` need int64 end
+    points (e.g. epoch seconds); other end points make ``save`` raise TypeError.
+
+    :Example:
+
+    >>> shifts = IntervalAVLTree()
+    >>> shifts.batch_insert([(9, 12), (13, 17), (10, 11)])
+    >>> list(shifts.overlapping(10, 11))
+    [(9, 12), (10, 11)]
+    >>> list(shifts.stabbing(14))
+    [(13, 17)]
+    """
+
+    node_class = IntervalNode
+    _snapshot_magic = INTERVAL_SNAPSHOT_MAGIC
+    _snapshot_width = 2
+
+    def overlapping(self, lo, hi):
+        """
+        Lazily yield the intervals overlapping [lo, hi], ordered by start.
+
+        Parameters:
+        lo: The start of the query range, inclusive.
+        hi: The end of the query range, inclusive.
+
+        Returns:
+        generator of tuple: The (start, end) intervals with start <= hi and end >= lo.
+        """
+        stack = []
+        node = self.root
+        while True:
+            # Push the left spine, skipping subtrees that end before lo
+            while node is not None and node.max_end >= lo:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            start, end = node.val
+            if start > hi:
+                return  # Every interval further right starts after hi as well
+            if end >= lo:
+                for _ in range(node.count):
+                    yield node.val
+            node = node.right
+
+    def stabbing(self, point):
+        """
+        Lazily yield the intervals containing point, ordered by start.
+
+        Parameters:
+        point: The point to look up.
+
+        Returns:
+        generator of tuple: The (start, end) intervals with start <= point <= end.
+        """
+        return self.overlapping(point, point)
+
+    def _snapshot_values(self):
+        for node in self._iter_nodes(self.root):
+            start, end = node.val
+            for _ in range(node.count):
+                yield start
+                yield end
+
+    @classmethod
+    def _from_snapshot_values(cls, values):
+        return cls.from_iterable(zip(values[0::2], values[1::2]), presorted=True)
+
+    def _insert_key(self, key):
+        self._check_interval(key)
+        super()._insert_key(key)
+
+    def _make_node(self, item):
+        self._check_interval(item)
+        return super()._make_node(item)
+
+    def _check_interval(self, key):
+        start, end = key
+        if end < start:
+            raise ValueError("Interval end must not be before its start")
+
+    def _update_size(self, node):
+        self._update(node)
+
+    def _update(self, node):
+        super()._update(node)
+        max_end = node.val[1]
+        if node.left is not None and node.left.max_end > max_end:
+            max_end = node.left.max_end
+        if node.right is not None and node.right.max_end > max_end:
+            max_end = node.right.max_end
+        node.max_end = max_end
+
+
+# Example usage
+if __name__ == "__main__":
+    shifts = IntervalAVLTree.from_iterable([(8, 16), (9, 12), (13, 17), (10, 11)])
+    print(list(shifts.overlapping(10, 11)))  # Should print [(8, 16), (9, 12), (10, 11)]
+    print(list(shifts.stabbing(17)))  # Should print [(13, 17)]
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the linked lists in datastructures.py.
+
+Run from this directory with ``python linked_list_benchmarks.py``.
+"""
+import queue
+import random
+import threading
+import time
+import timeit
+import tracemalloc
+
+from bench_utils import fill_drain, traced_bytes
+from cache import LFUCache, LRUCache
+from datastructures import BoundedLinkedQueue, LinkedList, Node, UnrolledLinkedList, iter_chain
+from node_pool import NodePool
+
+
+def bench_append(sizes=(10_000, 100_000, 1_000_000)):
+    print('Building a LinkedList with append:')
+    for n in sizes:
+        def build():
+            linked_list = LinkedList(max_size=n)
+            for i in range(n):
+                linked_list.append(i)
+
+        elapsed = timeit.timeit(build, number=1)
+        print(f'  {n:>9} elements: {elapsed:.3f} s ({elapsed / n * 1e9:.0f} ns per append)')
+
+
+def bench_index(n=100_000, removals=2_000):
+    print(f'Value index on a LinkedList of {n} elements:')
+    for label, values in (('unique values', list(range(n))), ('10 distinct values', [i % 10 for i in range(n)])):
+        for indexed in (False, True):
+            def build():
+                linked_list = LinkedList(max_size=n, indexed=indexed)
+                for value in values:
+                    linked_list.append(value)
+                return linked_list
+
+            linked_list, size = traced_bytes(build)
+            targets = random.sample(values, removals)
+            elapsed = timeit.timeit(lambda: [linked_list.remove(v) for v in targets], number=1)
+            print(f'  {label:<18} indexed={indexed!s:<5}: {size / n:.0f} bytes/element, '
+                  f'remove {elapsed / removals * 1e6:.1f} us')
+
+
+def bench_cache(max_size=1_000, keys=100_000, lookups=500_000):
+    print(f'Caches of {max_size} entries, {lookups} skewed lookups over {keys} keys:')
+    workload = [int(keys * random.random() ** 4) for _ in range(lookups)]
+    for cache_type in (LRUCache, LFUCache):
+        cache = cache_type(max_size=max_size)
+
+        def run():
+            for key in workload:
+                if cache.get(key) is None:
+                    cache.put(key, key)
+
+        elapsed = timeit.timeit(run, number=1)
+        stats = cache.stats()
+        print(f'  {cache_type.__name__}: {elapsed / lookups * 1e9:.0f} ns per lookup, '
+              f'hit rate {stats["hits"] / lookups:.1%}, {stats["evictions"]} evictions')
+
+
+def bench_unrolled(n=1_000_000):
+    print(f'LinkedList vs UnrolledLinkedList with {n} elements:')
+    variants = [('LinkedList', lambda: LinkedList(max_size=n))]
+    for chunk_size in (16, 64, 256):
+        variants.append((f'Unrolled chunk_size={chunk_size}',
+                         lambda chunk_size=chunk_size: UnrolledLinkedList(max_size=n, chunk_size=chunk_size)))
+    for label, make_list in variants:
+        def build():
+            linked_list = make_list()
+            for i in range(n):
+                linked_list.append(i & 255)
+            return linked_list
+
+        # values below 256 are shared small ints, so the sizes are pure structure
+        linked_list, size = traced_bytes(build)
+        elapsed = timeit.timeit(lambda: sum(1 for _ in reversed(linked_list)), number=3) / 3
+        print(f'  {label:<26}: {size / n:.0f} bytes/element, '
+              f'iterate {elapsed / n * 1e9:.0f} ns per element')
+
+
+def bench_scan(n=200_000, duration=1.0):
+    # a slow consumer scanning the list while a writer keeps appending
+    print(f'Writer throughput during a slow scan of {n} elements:')
+
+    def locked_scan(linked_list):
+        with linked_list.lock:
+            node = linked_list.head
+            while node:
+                node.value * 2
+                node = node.next
+
+    def chunked_scan(linked_list):
+        for value in linked_list:
+            value * 2
+
+    for label, scan in (('scan under lock', locked_scan), ('chunked iterator', chunked_scan)):
+        linked_list = LinkedList(max_size=10 ** 8)
+        for i in range(n):
+            linked_list.append(i & 255)
+        stop = threading.Event()
+
+        def reader():
+            while not stop.is_set():
+                scan(linked_list)
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        appends = 0
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            linked_list.append(1)
+            appends += 1
+        stop.set()
+        thread.join()
+        print(f'  {label:<17}: {appends / duration:>10,.0f} appends/s')
+
+
+def bench_splice(n=1_000_000):
+    print(f'Concatenating two lists of {n} elements:')
+
+    def filled():
+        linked_list = LinkedList(max_size=2 * n)
+        for i in range(n):
+            linked_list.append(i & 255)
+        return linked_list
+
+    first, second = filled(), filled()
+    elapsed = timeit.timeit(lambda: [first.append(value) for value in second], number=1)
+    print(f'  append one by one: {elapsed * 1e3:10.3f} ms')
+    first, second = filled(), filled()
+    elapsed = timeit.timeit(lambda: first.extend_list(second), number=1)
+    print(f'  extend_list:       {elapsed * 1e3:10.3f} ms')
+    elapsed = timeit.timeit(lambda: first.split_at(first.head.next.next), number=1)
+    print(f'  split_at(third node) of the {2 * n} joined elements: {elapsed * 1e3:.3f} ms')
+
+
+def _seen_set_traversal(head):
+    # the set-based cycle guard of DoublyLinkedListFixed.traverse in C2M1
+    visited = []
+    seen_nodes = set()
+    current = head
+    while current:
+        if current in seen_nodes:
+            break
+        seen_nodes.add(current)
+        visited.append(current)
+        current = current.next
+    return visited
+
+
+def bench_cycle_traversal(n=1_000_000):
+    print(f'Cycle-safe traversal of {n} nodes whose tail links back to the head:')
+    nodes = [Node(i & 255) for i in range(n)]
+    for previous, node in zip(nodes, nodes[1:]):
+        previous.next = node
+        node.prev = previous
+    nodes[-1].next = nodes[0]
+    head = nodes[0]
+    del nodes
+
+    def lazy():
+        count = 0
+        for _ in iter_chain(head):
+            count += 1
+        return count
+
+    for label, traverse in (('seen set + list', lambda: len(_seen_set_traversal(head))), ('iter_chain (Brent)', lazy)):
+        # timed without tracemalloc, which slows down every int allocation
+        elapsed = timeit.timeit(traverse, number=1)
+        tracemalloc.start()
+        traverse()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f'  {label:<18}: {elapsed * 1e3:7.1f} ms, peak {peak / 2 ** 20:7.2f} MiB')
+
+
+def bench_node_pool(live=200_000, rounds=10):
+    print(f'{rounds} rounds of appending then popping {live} elements:')
+
+    def fill(linked_list):
+        for i in range(live):
+            linked_list.append(i & 255)
+
+    def drain(linked_list):
+        for _ in range(live):
+            linked_list.popleft()
+
+    fill_drain(lambda pool: LinkedList(max_size=live, pool=pool), fill, drain,
+               (None, NodePool(Node, preallocate=live)), live, rounds, 'elements')
+
+
+def _hand_off(make_queue, put, get, items, batch, producers, consumers):
+    # every producer puts `items` values in batches; consumers split the total
+    buffer = make_queue()
+    per_consumer = items * producers // consumers
+
+    def produce():
+        for start in range(0, items, batch):
+            put(buffer, list(range(start, min(start + batch, items))))
+
+    def consume():
+        received = 0
+        while received < per_consumer:
+            received += len(get(buffer, min(batch, per_consumer - received)))
+
+    threads = [threading.Thread(target=produce) for _ in range(producers)]
+    threads += [threading.Thread(target=consume) for _ in range(consumers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def bench_queue(items=200_000, max_size=1_000, producers=2, consumers=2):
+    print(f'Hand-off of {items * producers} values, {producers} producers / {consumers} consumers, '
+          f'max_size={max_size}:')
+    variants = [
+        ('queue.Queue', 1, lambda: queue.Queue(max_size),
+         lambda q, values: [q.put(v) for v in values], lambda q, n: [q.get() for _ in range(n)]),
+    ]
+    for batch in (1, 16, 256):
+        variants.append((f'BoundedLinkedQueue batch={batch}', batch, lambda: BoundedLinkedQueue(max_size),
+                         BoundedLinkedQueue.put_many, BoundedLinkedQueue.get_many))
+    for label, batch, make_queue, put, get in variants:
+        elapsed = _hand_off(make_queue, put, get, items, batch, producers, consumers)
+        print(f'  {label:<30}: {items * producers / elapsed:>12,.0f} values/s')
+
+
+if __name__ == "__main__":
+    bench_append()
+    bench_index()
+    bench_cache()
+    bench_unrolled()
+    bench_node_pool()
+    bench_scan()
+    bench_splice()
+    bench_cycle_traversal()
+    bench_queue()
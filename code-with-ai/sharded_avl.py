@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+import threading
+import logging
+from bisect import bisect_right
+
+from avl import AVLTree
+
+logger = logging.getLogger(__name__)
+
+
+class _Shard(AVLTree):
+    # Set once the shard has been replaced by a re-split; operations that routed
+    # to it must look up the current layout again
+    retired = False
+
+
+class ShardedAVLTree:
+    """
+    AVL tree range-partitioned into independent shards, each with its own lock.
+
+    Shard i holds the keys k with ``boundaries[i - 1] <= k < boundaries[i]``, so
+    writers to different ranges never contend. Routing reads an immutable
+    (boundaries, shards) layout without locking. A shard that grows beyond
+    ``split_threshold`` keys is split at its median and the new layout is
+    published atomically, so hot ranges end up finely partitioned while cold
+    ranges stay in a few large shards.
+
+    Parameters:
+    boundaries (iterable of int): Initial split points in ascending order. With
+        none, the tree starts as one shard and splits as it grows.
+    split_threshold (int): The number of keys at which a shard is split.
+
+    :Example:
+
+    >>> tree = ShardedAVLTree(boundaries=[100, 200])
+    >>> tree.batch_insert([250, 50, 150])
+    >>> list(tree), tree.boundaries
+    ([50, 150, 250], (100, 200))
+    """
+
+    def __init__(self, boundaries=None, split_threshold=50_000):
+        boundaries = tuple(boundaries or ())
+        if list(boundaries) != sorted(set(boundaries)):
+            raise ValueError("Shard boundaries must be strictly ascending")
+        self._layout = (boundaries, tuple(_Shard() for _ in range(len(boundaries) + 1)))
+        self.split_threshold = split_threshold
+        self._split_lock = threading.Lock()
+
+    @property
+    def boundaries(self):
+        return self._layout[0]
+
+    @property
+    def shards(self):
+        return self._layout[1]
+
+    def __len__(self):
+        return sum(len(shard) for shard in self.shards)
+
+    def __contains__(self, key):
+        return self.search(key) is not None
+
+    def __iter__(self):
+        """
+        Yield all keys in ascending order, one shard at a time.
+
+        Each shard is copied under its own lock before its keys are yielded, so
+        iteration never blocks writers for longer than one shard copy.
+        """
+        for shard in self.shards:
+            with shard.tree_lock:
+                keys = [node.val for node in shard._iter_nodes(shard.root)]
+            yield from keys
+
+    def insert(self, key):
+        """
+        Insert a key into the shard owning its range.
+
+        Parameters:
+        key (int): The key to be inserted into the tree.
+
+        Returns:
+        None
+        """
+        self.batch_insert((key,))
+
+    def delete(self, key):
+        """
+        Delete a node with the specified key from the shard owning its range.
+
+        Parameters:
+        key (int): The key of the node to be deleted.
+
+        Returns:
+        None
+        """
+        self.batch_delete((key,))
+
+    def search(self, key):
+        """
+        Search for a key in the shard owning its range.
+
+        Parameters:
+        key (int): The key to search for in the tree.
+
+        Returns:
+        AVLNode: The node containing the key, or None if the key is not found.
+        """
+        while True:
+            shard = self._route(key)
+            result = shard.search(key)
+            if not shard.retired:
+                return result
+
+    def batch_insert(self, keys):
+        """
+        Insert keys, taking each shard's lock once per batch.
+
+        Parameters:
+        keys (list of int): The keys to be inserted into the tree.
+
+        Returns:
+        None
+        """
+        touched = self._apply(keys, AVLTree.batch_insert)
+        for shard in touched:
+            self._maybe_split(shard)
+
+    def batch_delete(self, keys):
+        """
+        Delete keys, taking each shard's lock once per batch.
+
+        Parameters:
+        keys (list of int): The keys of the nodes to be deleted.
+
+        Returns:
+        None
+        """
+        self._apply(keys, AVLTree.batch_delete)
+
+    def _route(self, key):
+        boundaries, shards = self._layout
+        return shards[bisect_right(boundaries, key)]
+
+    def _apply(self, keys, operation):
+        # Group the keys per shard, then apply each group under that shard's lock.
+        # Groups that hit a retired shard are routed again against the new layout.
+        pending = list(keys)
+        touched = []
+        while pending:
+            groups = {}
+            for key in pending:
+                groups.setdefault(self._route(key), []).append(key)
+            pending = []
+            for shard, group in groups.items():
+                with shard.tree_lock:
+                    if shard.retired:
+                        pending.extend(group)
+                        continue
+                    operation(shard, group)
+                touched.append(shard)
+        return touched
+
+    def _maybe_split(self, shard):
+        if len(shard) < self.split_threshold:
+            return
+        with shard.tree_lock:
+            # A shard of one repeated key cannot be split; checking that in
+            # O(log n) keeps it from being copied under _split_lock on every batch
+            low = shard._get_min_value_node(shard.root)
+            high = shard._get_max_value_node(shard.root)
+            if low is None or low.val == high.val:
+                return
+
+        with self._split_lock, shard.tree_lock:
+            boundaries, shards = self._layout
+            if shard.retired:
+                return
+            keys = [node.val for node in shard._iter_nodes(shard.root)]
+            mid = self._split_point(keys)
+            if mid is None:
+                return
+
+            index = shards.index(shard)
+            left = _Shard.from_iterable(keys[:mid], presorted=True)
+            right = _Shard.from_iterable(keys[mid:], presorted=True)
+            self._layout = (
+                boundaries[:index] + (keys[mid],) + boundaries[index:],
+                shards[:index] + (left, right) + shards[index + 1:],
+            )
+            shard.retired = True
+            logger.debug('Split shard %d at key %s into %d and %d keys', index, keys[mid], mid, len(keys) - mid)
+
+    @staticmethod
+    def _split_point(keys):
+        # The index closest to the median that keeps equal keys together on the
+        # right-hand side, or None when all keys are equal
+        half = len(keys) // 2
+        for mid in range(half, 0, -1):
+            if keys[mid - 1] != keys[mid]:
+                return mid
+        for mid in range(half + 1, len(keys)):
+            if keys[mid - 1] != keys[mid]:
+                return mid
+        return None
+
+
+# Example usage
+if __name__ == "__main__":
+    tree = ShardedAVLTree(split_threshold=4)
+    tree.batch_insert(range(20))
+    print(tree.boundaries)  # Adaptive split points
+    print(list(tree) == list(range(20)))  # Should print True
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# code-with-ai is not an importable package name, so its modules are imported
+# the way the scripts in it import each other
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
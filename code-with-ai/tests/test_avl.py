@@ -0,0 +1,268 @@
+import bisect
+import operator
+import random
+
+import pytest
+from avl import AVLMap, AVLMultiset, AVLTree
+from avl_snapshot import SnapshotAVLTree
+from interval_tree import IntervalAVLTree
+
+_SET_OPERATIONS = {
+    'union': operator.or_,
+    'intersection': operator.and_,
+    'difference': operator.sub,
+}
+
+def _check_avl(node, lo=None, hi=None):
+    # asserts order, height, balance and size below node; returns (height, size).
+    # Plain trees keep duplicate keys as separate nodes, so bounds are inclusive.
+    if node is None:
+        return 0, 0
+    assert (lo is None or lo <= node.val) and (hi is None or node.val <= hi)
+    left_height, left_size = _check_avl(node.left, lo, node.val)
+    right_height, right_size = _check_avl(node.right, node.val, hi)
+    assert abs(left_height - right_height) <= 1
+    assert node.height == 1 + max(left_height, right_height)
+    assert node.size == node.count + left_size + right_size
+    return node.height, node.size
+
+def _random_keys(rng, universe=200, most=80):
+    return set(rng.sample(range(universe), rng.randrange(most)))
+
+@pytest.mark.parametrize('tree_type', [AVLTree, SnapshotAVLTree, AVLMultiset])
+def test_contains_searches_instead_of_iterating(tree_type, monkeypatch):
+    """
+    Objective: Ensure that `key in tree` is a lookup rather than a walk over every key.
+    """
+    tree = tree_type.from_iterable(range(0, 100, 2))
+    monkeypatch.setattr(tree_type, 'irange', None)
+
+    assert 42 in tree
+    assert 43 not in tree
+
+def test_contains_on_maps_and_interval_trees():
+    """
+    Objective: Ensure that every tree flavour answers membership for its own key type.
+    """
+    shifts = AVLMap()
+    shifts[9] = 'early'
+    intervals = IntervalAVLTree()
+    intervals.insert((1, 5))
+
+    assert 9 in shifts and 8 not in shifts
+    assert (1, 5) in intervals and (1, 6) not in intervals
+
+def test_multiset_set_operations_combine_counts():
+    """
+    Objective: Ensure that multiset union, intersection and difference combine counts like Counter.
+    """
+    def multisets():
+        return AVLMultiset.from_iterable([3, 3, 5, 9, 9, 9]), AVLMultiset.from_iterable([3, 3, 3, 3, 7, 9])
+
+    first, second = multisets()
+    assert list(first.union(second)) == [3, 3, 3, 3, 5, 7, 9, 9, 9]
+    first, second = multisets()
+    assert list(first.intersection(second)) == [3, 3, 9]
+    first, second = multisets()
+    difference = first.difference(second)
+    assert list(difference) == [5, 9, 9]
+    assert len(difference) == 3 and difference.count(3) == 0
+
+def test_multiset_split_and_join_keep_copies():
+    """
+    Objective: Ensure that split reports every copy of its key and join adds one copy.
+    """
+    left, copies, right = AVLMultiset.from_iterable([1, 3, 3, 3, 5, 5]).split(3)
+
+    assert (list(left), copies, list(right)) == ([1], 3, [5, 5])
+    assert list(AVLMultiset.join(left, 3, right)) == [1, 3, 5, 5]
+
+def test_map_set_operations_keep_payloads():
+    """
+    Objective: Ensure that map set operations keep the documented value for keys in both maps.
+    """
+    def maps():
+        first, second = AVLMap(), AVLMap()
+        for key in (1, 2, 3):
+            first[key] = f"first {key}"
+        for key in (2, 3, 4):
+            second[key] = f"second {key}"
+        return first, second
+
+    first, second = maps()
+    assert list(first.union(second).items()) == [
+        (1, 'first 1'), (2, 'second 2'), (3, 'second 3'), (4, 'second 4')]
+    first, second = maps()
+    assert list(first.intersection(second).items()) == [(2, 'first 2'), (3, 'first 3')]
+    first, second = maps()
+    assert list(first.difference(second).items()) == [(1, 'first 1')]
+
+def test_map_split_and_join_round_trip_payloads():
+    """
+    Objective: Ensure that map split reports the separating pair and join restores it.
+    """
+    shifts = AVLMap()
+    for key, value in [(1, 'early'), (5, 'late'), (9, 'night')]:
+        shifts[key] = value
+
+    left, item, right = shifts.split(5)
+    assert item == (5, 'late')
+    assert list(AVLMap.join(left, item, right).items()) == [(1, 'early'), (5, 'late'), (9, 'night')]
+    assert AVLMap().split(5)[1] is None
+
+@pytest.mark.parametrize('seed', range(20))
+@pytest.mark.parametrize('operation', _SET_OPERATIONS)
+@pytest.mark.parametrize('tree_type', [AVLTree, SnapshotAVLTree])
+def test_set_operations_match_python_sets(tree_type, operation, seed):
+    """
+    Objective: Ensure that union, intersection and difference give balanced trees holding the set result.
+    """
+    rng = random.Random(seed)
+    first, second = _random_keys(rng), _random_keys(rng)
+
+    result = getattr(tree_type.from_iterable(first), operation)(tree_type.from_iterable(second))
+
+    _check_avl(result.root)
+    assert list(result) == sorted(_SET_OPERATIONS[operation](first, second))
+
+@pytest.mark.parametrize('operation', _SET_OPERATIONS)
+def test_set_operations_consume_plain_and_keep_snapshot_inputs(operation):
+    """
+    Objective: Ensure that plain inputs are emptied while copy-on-write inputs stay intact and balanced.
+    """
+    rng = random.Random(operation)
+    first, second = _random_keys(rng), _random_keys(rng)
+    plain = AVLTree.from_iterable(first), AVLTree.from_iterable(second)
+    shared = SnapshotAVLTree.from_iterable(first), SnapshotAVLTree.from_iterable(second)
+
+    getattr(plain[0], operation)(plain[1])
+    getattr(shared[0], operation)(shared[1])
+
+    assert plain[0].root is None and plain[1].root is None
+    for tree, keys in zip(shared, (first, second)):
+        _check_avl(tree.root)
+        assert list(tree) == sorted(keys)
+
+@pytest.mark.parametrize('seed', range(20))
+@pytest.mark.parametrize('tree_type', [AVLTree, SnapshotAVLTree])
+def test_split_and_join_match_python_sets(tree_type, seed):
+    """
+    Objective: Ensure that split partitions the keys around a key and join puts them back together.
+    """
+    rng = random.Random(seed)
+    keys = _random_keys(rng)
+    key = rng.randrange(200)
+    tree = tree_type.from_iterable(keys)
+
+    left, found, right = tree.split(key)
+    _check_avl(left.root)
+    _check_avl(right.root)
+    assert found == (key in keys)
+    assert list(left) == sorted(k for k in keys if k < key)
+    assert list(right) == sorted(k for k in keys if k > key)
+    if tree_type is SnapshotAVLTree:
+        assert list(tree) == sorted(keys)
+
+    joined = tree_type.join(left, key, right)
+    _check_avl(joined.root)
+    assert list(joined) == sorted(keys | {key})
+
+@pytest.mark.parametrize('sizes', [(0, 50), (50, 0), (1, 300), (300, 1), (120, 130)])
+def test_join_balances_trees_of_different_heights(sizes):
+    """
+    Objective: Ensure that join stays balanced when one side is much taller than the other.
+    """
+    left = AVLTree.from_iterable(range(sizes[0]))
+    right = AVLTree.from_iterable(range(sizes[0] + 1, sizes[0] + 1 + sizes[1]))
+
+    joined = AVLTree.join(left, sizes[0], right)
+
+    _check_avl(joined.root)
+    assert list(joined) == list(range(sum(sizes) + 1))
+
+def test_join_and_set_operations_reject_bad_inputs():
+    """
+    Objective: Ensure that join checks the separator and set operations refuse mixed tree kinds.
+    """
+    with pytest.raises(ValueError):
+        AVLTree.join(AVLTree.from_iterable([5]), 3, AVLTree.from_iterable([7]))
+    with pytest.raises(ValueError):
+        AVLTree.join(AVLTree.from_iterable([1]), 3, AVLTree.from_iterable([3]))
+    with pytest.raises(TypeError):
+        AVLTree.from_iterable([1]).union(SnapshotAVLTree.from_iterable([2]))
+
+def _random_edits(rng, tree, model, count, universe=100):
+    # applies count random inserts and deletes to tree and to the sorted list model
+    for _ in range(count):
+        key = rng.randrange(universe)
+        if rng.random() < 0.55:
+            tree.insert(key)
+            bisect.insort(model, key)
+        else:
+            tree.delete(key)
+            if key in model:
+                model.remove(key)
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('iterative', [True, False])
+def test_insert_and_delete_keep_the_tree_balanced(iterative, seed):
+    """
+    Objective: Ensure that both engines, including the early-exit retrace, keep every invariant after each edit.
+    """
+    rng = random.Random(seed)
+    tree = AVLTree(iterative=iterative)
+    model = []
+
+    for _ in range(300):
+        _random_edits(rng, tree, model, 1)
+        _check_avl(tree.root)
+    assert list(tree) == model and len(tree) == len(model)
+
+@pytest.mark.parametrize('seed', range(10))
+def test_snapshots_are_unchanged_by_later_writes(seed):
+    """
+    Objective: Ensure that every snapshot keeps its keys and invariants while the tree and other snapshots change.
+    """
+    rng = random.Random(seed)
+    tree = SnapshotAVLTree()
+    model = []
+    snapshots = []
+
+    for _ in range(10):
+        _random_edits(rng, tree, model, 40)
+        snapshots.append((tree.snapshot(), list(model)))
+    branch, branch_model = snapshots[3]
+    _random_edits(rng, branch, list(branch_model), 40)
+
+    for snapshot, keys in snapshots:
+        if snapshot is not branch:
+            _check_avl(snapshot.root)
+            assert list(snapshot) == keys
+    _check_avl(tree.root)
+    assert list(tree) == model
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('tree_type', [AVLTree, SnapshotAVLTree, AVLMultiset])
+def test_order_statistics_match_a_sorted_list(tree_type, seed):
+    """
+    Objective: Ensure that rank, select, count_range and irange agree with a sorted list of the keys.
+    """
+    rng = random.Random(seed)
+    keys = sorted(rng.choices(range(60), k=rng.randrange(1, 80)))
+    tree = tree_type.from_iterable(keys)
+    _check_avl(tree.root)
+
+    for k, key in enumerate(keys):
+        assert tree.select(k) == key
+    with pytest.raises(IndexError):
+        tree.select(len(keys))
+    for _ in range(30):
+        lo, hi = sorted(rng.randrange(-5, 65) for _ in range(2))
+        inclusive = (rng.random() < 0.5, rng.random() < 0.5)
+        expected = [key for key in keys
+                    if (lo < key or (inclusive[0] and key == lo)) and (key < hi or (inclusive[1] and key == hi))]
+        assert tree.rank(lo) == bisect.bisect_left(keys, lo)
+        assert tree.count_range(lo, hi) == bisect.bisect_right(keys, hi) - bisect.bisect_left(keys, lo)
+        assert list(tree.irange(lo, hi, inclusive)) == expected
+        assert list(tree.irange(lo, hi, inclusive, reverse=True)) == expected[::-1]
+    assert list(reversed(tree)) == keys[::-1]
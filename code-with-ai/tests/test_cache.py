@@ -0,0 +1,106 @@
+import types
+
+import pytest
+from cache import LFUCache, LRUCache, memoize
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = types.SimpleNamespace(now=0.0)
+    monkeypatch.setattr('cache.time', types.SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+def test_lru_evicts_least_recently_used():
+    """
+    Objective: Ensure that LRUCache evicts the entry that was used the longest time ago.
+    """
+    cache = LRUCache(max_size=3)
+    for key in 'abc':
+        cache.put(key, key.upper())
+    cache.get('a')
+    cache.put('b', 'B2')
+
+    cache.put('d', 'D')
+    cache.put('e', 'E')
+
+    assert 'c' not in cache and 'a' not in cache
+    assert [cache.get(key) for key in 'bde'] == ['B2', 'D', 'E']
+    assert cache.evictions == 2
+
+def test_lfu_evicts_least_frequently_used_then_oldest():
+    """
+    Objective: Ensure that LFUCache evicts the lowest access count, breaking ties by age.
+    """
+    cache = LFUCache(max_size=3)
+    for key in 'abc':
+        cache.put(key, key.upper())
+    cache.get('a')
+    cache.get('a')
+    cache.get('c')
+
+    cache.put('d', 'D')
+    assert 'b' not in cache
+    cache.put('e', 'E')
+
+    assert 'd' not in cache
+    assert all(key in cache for key in 'ace')
+
+def test_lfu_recovers_minimum_after_pop():
+    """
+    Objective: Ensure that LFUCache still evicts correctly after the lowest bucket is popped empty.
+    """
+    cache = LFUCache(max_size=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('b')
+    cache.pop('a')
+    cache.put('c', 3)
+
+    cache.put('d', 4)
+
+    assert 'c' not in cache and 'b' in cache and 'd' in cache
+
+@pytest.mark.parametrize('cache_type', [LRUCache, LFUCache])
+def test_ttl_expires_entries(cache_type, clock):
+    """
+    Objective: Ensure that entries expire ttl seconds after their last put, not their last get.
+    """
+    cache = cache_type(max_size=10, ttl=5)
+    cache.put('a', 1)
+    clock.now = 3
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+
+    clock.now = 5
+    assert cache.get('a') is None
+    assert cache.get('b') == 2
+    clock.now = 8
+    assert 'b' not in cache
+    assert cache.stats()['expirations'] == 2 and len(cache) == 0
+
+def test_memoize_separates_args_from_kwargs():
+    """
+    Objective: Ensure that positional arguments shaped like keyword items do not share a key with them.
+    """
+    calls = []
+
+    @memoize(LRUCache(max_size=10))
+    def record(*args, **kwargs):
+        calls.append((args, kwargs))
+        return len(calls)
+
+    assert record(1, a=2) == 1
+    assert record((1,), (('a', 2),)) == 2
+    assert record(1, a=2) == 1
+    assert record(1, 2) == 3
+    assert record.cache.hits == 1
+
+def test_memoize_ignores_keyword_order():
+    """
+    Objective: Ensure that keyword arguments hit the same entry whatever order they are passed in.
+    """
+    @memoize(LRUCache(max_size=10))
+    def add(a, b):
+        return a + b
+
+    assert add(a=1, b=2) == add(b=2, a=1) == 3
+    assert add.cache.hits == 1
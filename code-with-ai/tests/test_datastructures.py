@@ -0,0 +1,110 @@
+import threading
+
+import pytest
+from datastructures import LinkedList, Node
+from node_pool import NodePool
+
+@pytest.fixture
+def linked_list():
+    linked_list = LinkedList(max_size=10_000)
+    for value in range(5):
+        linked_list.append(value)
+    return linked_list
+
+def _filled(values, **kwargs):
+    linked_list = LinkedList(max_size=10_000, **kwargs)
+    for value in values:
+        linked_list.append(value)
+    return linked_list
+
+def test_extend_list_moves_all_nodes(linked_list):
+    """
+    Objective: Ensure that extend_list appends every node of the other list and empties it.
+    """
+    other = _filled([7, 8])
+
+    linked_list.extend_list(other)
+
+    assert linked_list.to_list() == [0, 1, 2, 3, 4, 7, 8]
+    assert len(linked_list) == 7 and len(other) == 0
+    linked_list.validate()
+    other.validate()
+
+def test_splice_and_split_at(linked_list):
+    """
+    Objective: Ensure that splice inserts after a node and split_at detaches the rest.
+    """
+    linked_list.splice(linked_list.find(1), _filled([7, 8]))
+    rest = linked_list.split_at(linked_list.find(2))
+
+    assert linked_list.to_list() == [0, 1, 7, 8]
+    assert rest.to_list() == [2, 3, 4]
+    linked_list.validate()
+    rest.validate()
+
+@pytest.mark.parametrize("pool", [None, NodePool(Node)])
+def test_extend_list_races_with_pop_and_append(pool):
+    """
+    Objective: Ensure that extend_list lands at the end while other threads pop and append.
+    """
+    linked_list = _filled(range(100), pool=pool)
+    stop = threading.Event()
+
+    def churn():
+        while not stop.is_set():
+            linked_list.append(-1)
+            linked_list.pop()
+            linked_list.pop()
+            linked_list.append(-1)
+
+    thread = threading.Thread(target=churn)
+    thread.start()
+    try:
+        for _ in range(2000):
+            linked_list.extend_list(_filled([1_000]))
+            linked_list.validate()
+            assert linked_list.to_list()[-1] in (1_000, -1)
+    finally:
+        stop.set()
+        thread.join()
+    linked_list.validate()
+    assert len(linked_list) == len(linked_list.to_list())
+
+def test_paused_iterator_does_not_hold_back_writers():
+    """
+    Objective: Ensure that a started but unfinished iterator blocks neither node recycling nor moves.
+    """
+    pool = NodePool(Node)
+    linked_list = _filled(range(10), pool=pool)
+    iterator = linked_list._walk(forward=True, chunk_size=2)
+    next(iterator)
+
+    for _ in range(5):
+        linked_list.popleft()
+    assert len(pool) == 5
+
+    node = linked_list.find(7)
+    linked_list.move_to_end(7)
+    assert linked_list.tail is node
+
+    other = _filled([20, 21])
+    rest = linked_list.split_at(linked_list.find(9))
+    other.extend_list(linked_list)
+    assert rest.to_list() == [9, 7] and other.to_list() == [20, 21, 5, 6, 8]
+    assert list(iterator) == [1]
+    assert not linked_list._cursors
+
+@pytest.mark.parametrize('forward', [True, False])
+def test_iterator_resumes_after_its_node_is_removed(forward):
+    """
+    Objective: Ensure that an iterator whose last node was removed resumes at the next unvisited value.
+    """
+    linked_list = _filled(range(6))
+    iterator = linked_list._walk(forward, chunk_size=2)
+    seen = [next(iterator), next(iterator)]
+
+    linked_list.remove(seen[1])
+    linked_list.remove(seen[0])
+    seen.extend(iterator)
+
+    assert seen == ([0, 1, 2, 3, 4, 5] if forward else [5, 4, 3, 2, 1, 0])
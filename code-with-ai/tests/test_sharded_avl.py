@@ -0,0 +1,62 @@
+import threading
+
+from sharded_avl import ShardedAVLTree
+
+class _CountingLock:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.acquired = 0
+
+    def __enter__(self):
+        self.acquired += 1
+        return self.lock.__enter__()
+
+    def __exit__(self, *exc_info):
+        return self.lock.__exit__(*exc_info)
+
+def test_repeated_key_shard_is_not_recopied():
+    """
+    Objective: Ensure that a shard holding one repeated key is not re-split on every insert.
+    """
+    tree = ShardedAVLTree(split_threshold=10)
+    tree._split_lock = _CountingLock()
+
+    for _ in range(500):
+        tree.insert(7)
+
+    assert tree._split_lock.acquired == 0
+    assert len(tree) == 500 and len(tree.shards) == 1
+
+def test_split_keeps_equal_keys_together():
+    """
+    Objective: Ensure that shards split next to a run of equal keys when the median falls inside it.
+    """
+    tree = ShardedAVLTree(split_threshold=10)
+    tree.batch_insert([2] * 9 + [3])
+
+    assert tree.boundaries == (3,)
+    assert list(tree) == [2] * 9 + [3]
+
+def test_shards_split_and_keep_order():
+    """
+    Objective: Ensure that growing shards split at their median and keep every key.
+    """
+    tree = ShardedAVLTree(split_threshold=8)
+    tree.batch_insert(range(100))
+    for key in range(0, 100, 3):
+        tree.delete(key)
+
+    assert len(tree.shards) > 1
+    assert list(tree) == [key for key in range(100) if key % 3]
+    assert tree.search(50).val == 50 and tree.search(51) is None
+
+def test_contains_routes_to_one_shard(monkeypatch):
+    """
+    Objective: Ensure that `key in tree` searches the owning shard instead of copying every shard.
+    """
+    tree = ShardedAVLTree(boundaries=[100, 200])
+    tree.batch_insert([50, 150, 250])
+    monkeypatch.setattr(ShardedAVLTree, '__iter__', None)
+
+    assert 150 in tree and 250 in tree
+    assert 151 not in tree
@@ -0,0 +1,161 @@
+import pytest
+from avl import AVLMap, AVLTree
+from avl_array import ArrayAVLTree
+from interval_tree import IntervalAVLTree
+
+@pytest.fixture(params=[AVLTree, ArrayAVLTree])
+def tree_type(request):
+    return request.param
+
+def _saved(tree_type, tmp_path, keys=range(100)):
+    path = tmp_path / 'tree.snapshot'
+    tree_type.from_iterable(keys).save(path)
+    return path
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_load_round_trip(tree_type, tmp_path, mmap):
+    """
+    Objective: Ensure that a saved tree loads back with the same keys on both load paths.
+    """
+    tree = tree_type.load(_saved(tree_type, tmp_path, [5, 1, 9, 3]), mmap=mmap)
+
+    assert len(tree) == 4
+    assert all(tree.search(key) is not None for key in [1, 3, 5, 9])
+    assert tree.search(4) is None
+
+_CORRUPTIONS = {
+    'empty': lambda data: b'',
+    'partial header': lambda data: data[:3],
+    'short by a key': lambda data: data[:-8],
+    'short by a byte': lambda data: data[:-1],
+    'padded by a byte': lambda data: data + b'\0',
+    'padded by a key': lambda data: data + b'\0' * 8,
+}
+
+@pytest.mark.parametrize('mmap', [True, False])
+@pytest.mark.parametrize('corrupt', _CORRUPTIONS.values(), ids=_CORRUPTIONS.keys())
+def test_load_rejects_wrong_length(tree_type, tmp_path, mmap, corrupt):
+    """
+    Objective: Ensure that a truncated or padded snapshot raises ValueError instead of loading.
+    """
+    path = _saved(tree_type, tmp_path)
+    path.write_bytes(corrupt(path.read_bytes()))
+
+    with pytest.raises(ValueError):
+        tree_type.load(path, mmap=mmap)
+
+def test_load_rejects_empty_tree_with_trailing_data(tmp_path):
+    """
+    Objective: Ensure that AVLTree.load does not cast bytes past an empty snapshot's header into keys.
+    """
+    path = _saved(AVLTree, tmp_path, [])
+    path.write_bytes(path.read_bytes() + b'\0' * 16)
+
+    with pytest.raises(ValueError):
+        AVLTree.load(path)
+
+def test_map_round_trip_keeps_values(tmp_path):
+    """
+    Objective: Ensure that AVLMap snapshots restore every key with its value.
+    """
+    shifts = AVLMap()
+    for key, value in [(9, 'early'), (1, {'crew': 3}), (5, None)]:
+        shifts[key] = value
+    path = tmp_path / 'map.snapshot'
+    shifts.save(path)
+
+    loaded = AVLMap.load(path)
+
+    assert list(loaded.items()) == [(1, {'crew': 3}), (5, None), (9, 'early')]
+
+def test_map_and_tree_snapshots_are_not_interchangeable(tmp_path):
+    """
+    Objective: Ensure that a map snapshot is not loaded as a tree snapshot and vice versa.
+    """
+    tree_path = _saved(AVLTree, tmp_path)
+    map_path = tmp_path / 'map.snapshot'
+    AVLMap().save(map_path)
+
+    with pytest.raises(ValueError):
+        AVLMap.load(tree_path)
+    with pytest.raises(ValueError):
+        AVLTree.load(map_path)
+
+@pytest.mark.parametrize('corrupt', _CORRUPTIONS.values(), ids=_CORRUPTIONS.keys())
+def test_map_load_rejects_wrong_length(tmp_path, corrupt):
+    """
+    Objective: Ensure that a truncated or padded AVLMap snapshot raises ValueError.
+    """
+    shifts = AVLMap()
+    shifts[1] = 'late'
+    path = tmp_path / 'map.snapshot'
+    shifts.save(path)
+    path.write_bytes(corrupt(path.read_bytes()))
+
+    with pytest.raises(ValueError):
+        AVLMap.load(path)
+
+@pytest.mark.parametrize('tree_type', [AVLTree, ArrayAVLTree, AVLMap])
+def test_failed_save_keeps_previous_snapshot(tree_type, tmp_path, monkeypatch):
+    """
+    Objective: Ensure that a save interrupted mid-write leaves the earlier snapshot loadable.
+    """
+    path = tmp_path / 'tree.snapshot'
+    tree_type().save(path)
+    before = path.read_bytes()
+
+    def crash(fd):
+        raise OSError("disk full")
+    monkeypatch.setattr('atomic_file.os.fsync', crash)
+    keys = [(key, key) for key in range(10)] if tree_type is AVLMap else range(10)
+
+    with pytest.raises(OSError):
+        tree_type.from_iterable(keys).save(path)
+    assert path.read_bytes() == before
+    assert list(tmp_path.iterdir()) == [path]
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_interval_round_trip(tmp_path, mmap):
+    """
+    Objective: Ensure that interval snapshots restore every (start, end) pair, duplicates included.
+    """
+    shifts = IntervalAVLTree()
+    shifts.batch_insert([(9, 12), (13, 17), (10, 11), (10, 11)])
+    path = tmp_path / 'shifts.snapshot'
+    shifts.save(path)
+
+    loaded = IntervalAVLTree.load(path, mmap=mmap)
+
+    assert list(loaded) == [(9, 12), (10, 11), (10, 11), (13, 17)]
+    assert list(loaded.stabbing(14)) == [(13, 17)]
+
+@pytest.mark.parametrize('corrupt', _CORRUPTIONS.values(), ids=_CORRUPTIONS.keys())
+def test_interval_load_rejects_wrong_length_and_plain_snapshots(tmp_path, corrupt):
+    """
+    Objective: Ensure that interval snapshots are checked like plain ones and not confused with them.
+    """
+    shifts = IntervalAVLTree()
+    shifts.batch_insert([(1, 2), (3, 4)])
+    path = tmp_path / 'shifts.snapshot'
+    shifts.save(path)
+    data = path.read_bytes()
+    path.write_bytes(corrupt(data))
+
+    with pytest.raises(ValueError):
+        IntervalAVLTree.load(path)
+    path.write_bytes(data)
+    with pytest.raises(ValueError):
+        AVLTree.load(path)
+    with pytest.raises(ValueError):
+        IntervalAVLTree.load(_saved(AVLTree, tmp_path))
+
+def test_interval_save_rejects_non_integer_end_points(tmp_path):
+    """
+    Objective: Ensure that intervals that do not fit the int64 layout raise TypeError and write nothing.
+    """
+    shifts = IntervalAVLTree()
+    shifts.insert((1.5, 2))
+
+    with pytest.raises(TypeError):
+        shifts.save(tmp_path / 'shifts.snapshot')
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the task manager in tasks.py.
+
+Run from this directory with ``python task_benchmarks.py``.
+"""
+import itertools
+import random
+import threading
+import time
+import timeit
+
+from tasks import Task, TaskManager
+
+
+def _linear_get(tasks, task_id):
+    # The list scan get_task used before tasks were indexed by ID
+    for task in tasks:
+        if task.id == task_id:
+            return task
+    return None
+
+
+def bench_scaling(sizes=(1_000, 10_000, 100_000, 1_000_000), probes=1_000, scans=20):
+    print('TaskManager operations as the number of tasks grows (us per operation):')
+    print(f'  {"tasks":>9} {"create":>8} {"get":>8} {"update":>8} {"delete":>8} {"list scan":>10}')
+    for n in sizes:
+        tasks = [Task(name=f"Task {i}", description="Benchmark task") for i in range(n)]
+        manager = TaskManager()
+        create = timeit.timeit(lambda: [manager.create_task(task) for task in tasks], number=1) / n
+
+        sample = random.sample(tasks, probes)
+        get = timeit.timeit(lambda: [manager.get_task(task.id) for task in sample], number=1) / probes
+        update = timeit.timeit(lambda: [manager.update_task(task) for task in sample], number=1) / probes
+        scan_sample = sample[:scans]
+        scan = timeit.timeit(lambda: [_linear_get(tasks, task.id) for task in scan_sample], number=1) / scans
+        delete = timeit.timeit(lambda: [manager.delete_task(task.id) for task in sample], number=1) / probes
+        print(f'  {n:>9} {create * 1e6:>8.2f} {get * 1e6:>8.2f} {update * 1e6:>8.2f} '
+              f'{delete * 1e6:>8.2f} {scan * 1e6:>10.0f}')
+
+
+def bench_concurrent_readers(n=100_000, reader_counts=(1, 2, 4, 8), duration=1.0):
+    print(f'get_task throughput over {n} tasks with one writer updating tasks:')
+    tasks = [Task(name=f"Task {i}", description="Benchmark task") for i in range(n)]
+    manager = TaskManager()
+    for task in tasks:
+        manager.create_task(task)
+    ids = [task.id for task in tasks]
+
+    for readers in reader_counts:
+        stop = threading.Event()
+        reads = [0] * readers
+        updates = [0]
+
+        def read(slot):
+            count = 0
+            while not stop.is_set():
+                for task_id in random.sample(ids, 100):
+                    manager.get_task(task_id)
+                count += 100
+            reads[slot] = count
+
+        def write():
+            while not stop.is_set():
+                manager.update_task(random.choice(tasks))
+                updates[0] += 1
+
+        threads = [threading.Thread(target=read, args=(slot,)) for slot in range(readers)]
+        threads.append(threading.Thread(target=write))
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        print(f'  {readers} readers: {sum(reads) / duration:>12,.0f} gets/s, {updates[0] / duration:>10,.0f} updates/s')
+
+
+def _linear_search(manager, query):
+    # Substring matching over every task, the way tasks were searched before
+    terms = query.lower().split()
+    return [task for task in manager.list_tasks()
+            if all(term in f"{task.name} {task.description}".lower() for term in terms)]
+
+
+def bench_search(n=1_000_000, vocabulary=20_000):
+    print(f'Searching {n} tasks:')
+    words = [f"w{i}x{random.randrange(10 ** 6)}" for i in range(vocabulary)]
+    # A skewed word distribution, so common and rare terms both occur
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(vocabulary)))
+    manager = TaskManager()
+    start = time.perf_counter()
+    for _ in range(n):
+        name, *description = random.choices(words, cum_weights=cum_weights, k=6)
+        manager.create_task(Task(name=name, description=" ".join(description)))
+    print(f'  create with indexing: {(time.perf_counter() - start) / n * 1e6:.1f} us per task')
+
+    queries = [
+        ('common term', words[0]),
+        ('rare term', words[-1]),
+        ('two terms (AND)', f"{words[1]} {words[2]}"),
+        ('prefix', words[5][:5]),
+    ]
+    for label, query in queries:
+        indexed = timeit.timeit(lambda: manager.search(query, limit=10), number=5) / 5
+        linear = timeit.timeit(lambda: _linear_search(manager, query), number=1)
+        print(f'  {label:<16}: index {indexed * 1e3:8.2f} ms, linear scan {linear * 1e3:8.0f} ms, '
+              f'{len(manager.search(query, limit=None))} matches')
+
+
+if __name__ == "__main__":
+    bench_scaling()
+    bench_concurrent_readers()
+    bench_search()
@@ -1,9 +1,213 @@
-from typing import List, Optional
+import bisect
+import heapq
+import itertools
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# Task IDs are allocated from one process-wide counter, so they are never
+# reused, unlike memory addresses
+_next_task_id = itertools.count(1)
+_task_id_lock = threading.Lock()
+
+
+def _allocate_task_id() -> int:
+    with _task_id_lock:
+        return next(_next_task_id)
+
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens.
+
+    :param text: The text to split.
+    :type text: str
+    :return: The tokens in order of appearance.
+    :rtype: List[str]
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class _InvertedIndex:
+    """
+    An incremental token to task ID index over task names and descriptions.
+
+    Each token maps to the IDs of the tasks containing it and a weight: the
+    number of occurrences, with name occurrences counting ``NAME_WEIGHT`` times.
+    The tokens of every task are kept as well, so a task can be unindexed even
+    after it was modified in place.
+
+    Prefix lookups scan a sorted vocabulary that is only brought up to date
+    when a query needs it: new tokens are appended and removed ones are left
+    in place, so writes cost O(1) per token instead of an O(V) insort or del.
+    The next prefix query re-sorts the list, which timsort does in about
+    linear time since all but the appended tail is already in order, and
+    rebuilds it from the live tokens once stale entries outnumber them.
+    """
+
+    NAME_WEIGHT = 2
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._documents: Dict[int, Counter] = {}
+        self._vocabulary: List[str] = []
+        self._vocabulary_sorted = True
+        # Removed tokens still listed in _vocabulary, including duplicates of
+        # tokens that were removed and indexed again
+        self._stale_tokens = 0
+        self.lock = threading.Lock()
+
+    def add(self, task: "Task") -> None:
+        """
+        Index a task, replacing any earlier version with the same ID.
+
+        :param task: The task to index.
+        :type task: Task
+        """
+        weights = Counter(_tokenize(task.description))
+        for token in _tokenize(task.name):
+            weights[token] += self.NAME_WEIGHT
+        with self.lock:
+            self._remove(task.id)
+            self._documents[task.id] = weights
+            for token, weight in weights.items():
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = {}
+                    self._vocabulary.append(token)
+                    self._vocabulary_sorted = False
+                postings[task.id] = weight
+
+    def remove(self, task_id: int) -> None:
+        """
+        Remove a task from the index.
+
+        :param task_id: The ID of the task to remove.
+        :type task_id: int
+        """
+        with self.lock:
+            self._remove(task_id)
+
+    def search(self, query: str, prefix: bool, limit: Optional[int]) -> List[int]:
+        """
+        Return the IDs of the tasks matching every query term, best first.
+
+        Tasks are scored by TF-IDF summed over all matched tokens; ties are
+        broken by creation order.
+
+        :param query: The query text.
+        :type query: str
+        :param prefix: Match every token starting with a query term, not only the term itself.
+        :type prefix: bool
+        :param limit: The maximum number of IDs to return, or None for all.
+        :type limit: Optional[int]
+        :return: The IDs of the matching tasks.
+        :rtype: List[int]
+        """
+        terms = set(_tokenize(query))
+        if not terms:
+            return []
+        with self.lock:
+            matches = [self._matching_postings(term, prefix) for term in terms]
+            if not all(matches):
+                return []
+            # Start from the rarest term, then probe the candidates against the
+            # others or intersect with their full scores, whichever is cheaper
+            matches.sort(key=lambda postings: sum(map(len, postings)))
+            scores = self._scores(matches[0])
+            for postings in matches[1:]:
+                if len(scores) * len(postings) < sum(map(len, postings)):
+                    scores = self._probe(scores, postings)
+                else:
+                    term_scores = self._scores(postings)
+                    scores = {task_id: score + term_scores[task_id]
+                              for task_id, score in scores.items() if task_id in term_scores}
+                if not scores:
+                    return []
+
+        def rank(item: Tuple[int, float]) -> Tuple[float, int]:
+            return -item[1], item[0]
+
+        if limit is None:
+            ranked = sorted(scores.items(), key=rank)
+        else:
+            ranked = heapq.nsmallest(limit, scores.items(), key=rank)
+        return [task_id for task_id, _ in ranked]
+
+    def _remove(self, task_id: int) -> None:
+        weights = self._documents.pop(task_id, None)
+        if weights is None:
+            return
+        for token in weights:
+            postings = self._postings[token]
+            del postings[task_id]
+            if not postings:
+                del self._postings[token]
+                self._stale_tokens += 1
+
+    def _matching_postings(self, term: str, prefix: bool) -> List[Dict[int, int]]:
+        if not prefix:
+            postings = self._postings.get(term)
+            return [] if postings is None else [postings]
+        vocabulary = self._sorted_vocabulary()
+        matches = []
+        previous = None
+        i = bisect.bisect_left(vocabulary, term)
+        while i < len(vocabulary) and vocabulary[i].startswith(term):
+            token = vocabulary[i]
+            postings = self._postings.get(token)
+            # Skip removed tokens and the second copy of re-added ones
+            if postings is not None and token != previous:
+                matches.append(postings)
+            previous = token
+            i += 1
+        return matches
+
+    def _sorted_vocabulary(self) -> List[str]:
+        if self._stale_tokens > len(self._postings):
+            self._vocabulary = sorted(self._postings)
+            self._stale_tokens = 0
+        elif not self._vocabulary_sorted:
+            self._vocabulary.sort()
+        self._vocabulary_sorted = True
+        return self._vocabulary
+
+    def _idf(self, postings: Dict[int, int]) -> float:
+        return math.log(1 + len(self._documents) / len(postings))
+
+    def _scores(self, matches: List[Dict[int, int]]) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for postings in matches:
+            idf = self._idf(postings)
+            for task_id, weight in postings.items():
+                scores[task_id] = scores.get(task_id, 0.0) + weight * idf
+        return scores
+
+    def _probe(self, scores: Dict[int, float], matches: List[Dict[int, int]]) -> Dict[int, float]:
+        idfs = [(postings, self._idf(postings)) for postings in matches]
+        probed = {}
+        for task_id, score in scores.items():
+            extra = 0.0
+            for postings, idf in idfs:
+                weight = postings.get(task_id)
+                if weight:
+                    extra += weight * idf
+            if extra:
+                probed[task_id] = score + extra
+        return probed
+
 
 class Task:
     """
     A class to represent a task.
 
+    Every task gets a unique ID from a monotonic counter when it is created.
+
     :param name: The name of the task.
     :type name: str
     :param description: The description of the task.
@@ -22,7 +226,7 @@ class Task:
     def __init__(self, name: str, description: str):
         if not name:
             raise ValueError("Task name cannot be empty")
-        self.id = id(self)
+        self.id = _allocate_task_id()
         self.name = name
         self.description = description
 
@@ -50,6 +254,26 @@ class TaskManager:
     """
     A class to manage tasks.
 
+    Tasks are indexed by ID in an insertion-ordered dict, so getting, updating
+    and deleting a task take constant time while ``list_tasks`` keeps returning
+    the tasks in the order they were created.
+
+    The task manager is thread-safe. Writes to a task hold one of ``stripes``
+    locks chosen by its ID, so an update cannot race a delete of the same task
+    while writes to other tasks proceed. Lookups and listings are single dict
+    operations, which are atomic, so readers never wait for a lock and read
+    throughput grows with the number of reader threads.
+
+    Names and descriptions are kept in an inverted index, updated by every
+    create, update and delete, so ``search`` only touches the tasks containing
+    the query terms instead of scanning every task. The index has a single
+    lock that every create, update, delete and search also takes, so writes
+    to tasks in different stripes still serialize on the index; the striped
+    locks only order the writes to one task.
+
+    :param stripes: The number of write locks tasks are spread over.
+    :type stripes: int
+
     :Example:
 
     >>> manager = TaskManager()
@@ -58,11 +282,23 @@ class TaskManager:
     "Task 'Buy groceries' added."
     """
 
-    def __init__(self):
+    def __init__(self, stripes: int = 16):
+        """
+        Initialize the task manager with an empty task index.
+        """
+        self._tasks: Dict[int, Task] = {}
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._index = _InvertedIndex()
+
+    @property
+    def tasks(self) -> List[Task]:
         """
-        Initialize the task manager with an empty list of tasks.
+        The managed tasks in creation order, as a new list.
+
+        :return: A list of all tasks.
+        :rtype: List[Task]
         """
-        self.tasks: List[Task] = []
+        return list(self._tasks.values())
 
     def create_task(self, task: Task) -> str:
         """
@@ -74,7 +310,9 @@ class TaskManager:
         :rtype: str
         """
         try:
-            self.tasks.append(task)
+            with self._lock_for(task.id):
+                self._tasks[task.id] = task
+                self._index.add(task)
             return f"Task '{task.name}' added."
         except ValueError as e:
             return str(e)
@@ -88,25 +326,23 @@ class TaskManager:
         :return: The task with the specified ID, or None if not found.
         :rtype: Optional[Task]
         """
-        for task in self.tasks:
-            if task.id == task_id:
-                return task
-        return None
+        return self._tasks.get(task_id)
 
     def update_task(self, task: Task) -> str:
         """
-        Update an existing task.
+        Update an existing task, keeping its position in the task order.
 
         :param task: The task to update.
         :type task: Task
         :return: A message indicating the task was updated, or not found.
         :rtype: str
         """
-        for i, t in enumerate(self.tasks):
-            if t.id == task.id:
-                self.tasks[i] = task
-                return f"Task '{task.name}' updated."
-        return "Task not found."
+        with self._lock_for(task.id):
+            if task.id not in self._tasks:
+                return "Task not found."
+            self._tasks[task.id] = task
+            self._index.add(task)
+        return f"Task '{task.name}' updated."
 
     def delete_task(self, task_id: int) -> str:
         """
@@ -117,16 +353,58 @@ class TaskManager:
         :return: A message indicating the task was removed, or not found.
         :rtype: str
         """
-        task = self.get_task(task_id)
+        with self._lock_for(task_id):
+            task = self._tasks.pop(task_id, None)
+            self._index.remove(task_id)
         if task:
-            self.tasks.remove(task)
             return f"Task '{task.name}' removed."
         else:
             return "Task not found."
 
+    def search(self, query: str, prefix: bool = True, limit: Optional[int] = 10) -> List[Task]:
+        """
+        Find the tasks whose name or description contains every query term.
+
+        Terms are matched case-insensitively against whole words, or against
+        word prefixes when ``prefix`` is set. Results are ranked by TF-IDF, with
+        matches in the name counting double.
+
+        :param query: The search terms, separated by spaces or punctuation.
+        :type query: str
+        :param prefix: Let a term match every word starting with it.
+        :type prefix: bool
+        :param limit: The maximum number of tasks to return, or None for all.
+        :type limit: Optional[int]
+        :return: The matching tasks, best match first.
+        :rtype: List[Task]
+
+        :Example:
+
+        >>> manager = TaskManager()
+        >>> _ = manager.create_task(Task(name="Buy groceries", description="Buy milk and eggs"))
+        >>> _ = manager.create_task(Task(name="Read a book", description="Buy a new book first"))
+        >>> [task.name for task in manager.search("buy")]
+        ['Buy groceries', 'Read a book']
+        >>> [task.name for task in manager.search("boo fir")]
+        ['Read a book']
+        """
+        tasks = (self._tasks.get(task_id) for task_id in self._index.search(query, prefix, limit))
+        return [task for task in tasks if task is not None]
+
+    def _lock_for(self, task_id: int) -> threading.Lock:
+        """
+        Return the write lock guarding the task with the given ID.
+
+        :param task_id: The ID of the task.
+        :type task_id: int
+        :return: The lock of the task's stripe.
+        :rtype: threading.Lock
+        """
+        return self._locks[hash(task_id) % len(self._locks)]
+
     def list_tasks(self) -> List[Task]:
         """
-        List all tasks in the task manager.
+        List all tasks in the task manager, in creation order.
 
         :return: A list of all tasks.
         :rtype: List[Task]
@@ -1,3 +1,5 @@
+import threading
+
 import pytest
 from src.tasks import TaskManager, Task
 
@@ -71,3 +73,151 @@ def test_get_non_existent_task(task_manager):
     retrieved_task = task_manager.get_task(non_existent_task_id)
 
     assert retrieved_task is None
+
+def test_list_tasks_keeps_creation_order(task_manager):
+    """
+    Objective: Ensure that updates keep a task's position and deletes keep the order of the rest.
+    """
+    tasks = [Task(name=f"Task {i}", description="Ordered task") for i in range(5)]
+    for task in tasks:
+        task_manager.create_task(task)
+
+    tasks[2].name = "Updated Task"
+    task_manager.update_task(tasks[2])
+    task_manager.delete_task(tasks[0].id)
+
+    assert task_manager.list_tasks() == tasks[1:]
+    assert task_manager.list_tasks()[1].name == "Updated Task"
+
+def test_update_and_delete_non_existent_task(task_manager):
+    """
+    Objective: Ensure that updating or deleting an unknown task reports it as not found.
+    """
+    task = Task(name="Test Task", description="This is a test task")
+
+    assert task_manager.update_task(task) == "Task not found."
+    assert task_manager.delete_task(task.id) == "Task not found."
+    assert task_manager.list_tasks() == []
+
+def test_task_ids_are_unique_and_never_reused():
+    """
+    Objective: Ensure that task IDs stay unique across threads and after tasks are garbage collected.
+    """
+    ids = []
+    failures = []
+
+    def create_tasks():
+        created = [Task(name="Task", description="Concurrent task").id for _ in range(1000)]
+        ids.extend(created)
+        if created != sorted(created):
+            failures.append("IDs allocated by one thread are not increasing")
+
+    threads = [threading.Thread(target=create_tasks) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    later = Task(name="Later Task", description="Created after the others were collected")
+    assert failures == []
+    assert len(set(ids)) == len(ids) == 8000
+    assert later.id > max(ids)
+
+def test_concurrent_updates_are_not_lost(task_manager):
+    """
+    Objective: Ensure that concurrent creates, updates and deletes all take effect while readers run.
+    """
+    workers, per_worker = 8, 500
+    kept = [[] for _ in range(workers)]
+    failures = []
+    stop = threading.Event()
+
+    def write(worker):
+        for i in range(per_worker):
+            task = Task(name=f"Worker {worker} task {i}", description="Stress test")
+            task_manager.create_task(task)
+            task.name = f"{task.name} updated"
+            if task_manager.update_task(task) != f"Task '{task.name}' updated.":
+                failures.append(f"update of {task} was lost")
+            if i % 2:
+                if task_manager.delete_task(task.id) != f"Task '{task.name}' removed.":
+                    failures.append(f"delete of {task} was lost")
+            else:
+                kept[worker].append(task)
+
+    def read():
+        while not stop.is_set():
+            for task in task_manager.list_tasks():
+                found = task_manager.get_task(task.id)
+                if found is not None and found is not task:
+                    failures.append(f"get_task returned {found} for {task}")
+
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    writers = [threading.Thread(target=write, args=(worker,)) for worker in range(workers)]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    tasks = task_manager.list_tasks()
+    assert failures == []
+    assert len(tasks) == workers * per_worker // 2
+    assert all(task.name.endswith(" updated") for task in tasks)
+    for worker_tasks in kept:
+        assert [task for task in tasks if task in worker_tasks] == worker_tasks
+
+def test_search_matches_all_terms_ranked(task_manager):
+    """
+    Objective: Ensure that search returns only tasks containing every term, name matches first.
+    """
+    in_description = Task(name="Weekly chores", description="Water the plants and buy soil")
+    in_name = Task(name="Buy plants", description="Visit the garden centre")
+    unrelated = Task(name="Buy groceries", description="Buy milk and eggs")
+    for task in (in_description, in_name, unrelated):
+        task_manager.create_task(task)
+
+    assert task_manager.search("plants buy") == [in_name, in_description]
+    assert task_manager.search("plan", prefix=False) == []
+    assert task_manager.search("gard cent") == [in_name]
+    assert task_manager.search("buy", limit=1) == [unrelated]
+
+def test_search_follows_updates_and_deletes(task_manager):
+    """
+    Objective: Ensure that the search index reflects in-place updates and deletions.
+    """
+    task = Task(name="Draft report", description="Quarterly numbers")
+    task_manager.create_task(task)
+
+    task.name = "Final report"
+    task_manager.update_task(task)
+    assert task_manager.search("draft") == []
+    assert task_manager.search("final") == [task]
+
+    task_manager.delete_task(task.id)
+    assert task_manager.search("report") == []
+
+def test_prefix_search_after_tokens_are_removed_and_reused(task_manager):
+    """
+    Objective: Ensure that prefix search skips removed tokens and counts re-indexed tokens once.
+    """
+    plums = Task(name="Fruit", description="plum plum plum plum")
+    filler = Task(name="Filler", description=" ".join(f"word{i}" for i in range(100)))
+    plumber = Task(name="Call", description="plumber")
+    for task in (plums, filler, plumber):
+        task_manager.create_task(task)
+    task_manager.delete_task(plumber.id)
+    assert task_manager.search("plum") == [plums]
+
+    plumbers = Task(name="Leak", description="plumber plumber plumber")
+    task_manager.create_task(plumbers)
+    assert task_manager.search("plum") == [plums, plumbers]
+
+    for i in range(200):
+        task = Task(name=f"plumber{i}", description="Temporary")
+        task_manager.create_task(task)
+        task_manager.delete_task(task.id)
+    assert task_manager.search("plum") == [plums, plumbers]
+    assert task_manager.search("plumber1") == []